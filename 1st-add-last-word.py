@@ -10,8 +10,18 @@ def create_new_word(word1, word2):
     return new_word
 
 # Example usage
-w1 = input("Enter first word: ")
-w2 = input("Enter second word: ")
+#   python 1st-add-last-word.py                       -> asks for two words
+#   python 1st-add-last-word.py pairs.txt             -> one "word1 word2" per line ("-" = stdin)
+#   python 1st-add-last-word.py firsts.txt seconds.txt
+if __name__ == "__main__":
+    import sys
 
-result = create_new_word(w1, w2)
-print("New word:", result)
+    if len(sys.argv) > 1:
+        from word_mash import run
+        run("join", sys.argv[1:3])
+    else:
+        w1 = input("Enter first word: ")
+        w2 = input("Enter second word: ")
+
+        result = create_new_word(w1, w2)
+        print("New word:", result)
@@ -1,14 +1,23 @@
+import sys
+
 import matplotlib.pyplot as plt
 
 from mpl_toolkits.mplot3d import Axes3D
 import numpy as np
 
+from pointcloud import LODPlot, load_points
+
 fig = plt.figure()
 ax = fig.add_subplot(111, projection='3d')
 
-x = [1, 2, 3, 4, 5]
-y = [2, 3, 5, 7, 11]
-z = [10, 5, 4, 0, 1]
+if len(sys.argv) > 1:
+    # Large .npy / raw float32 xyz dump: memory-mapped and voxel-decimated,
+    # refined again whenever the view is zoomed
+    lod = LODPlot(ax, load_points(sys.argv[1]), s=0.5, c='red')
+else:
+    x = [1, 2, 3, 4, 5]
+    y = [2, 3, 5, 7, 11]
+    z = [10, 5, 4, 0, 1]
 
-ax.scatter(x, y, z, c='red')
+    ax.scatter(x, y, z, c='red')
 plt.show()
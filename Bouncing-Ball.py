@@ -1,12 +1,12 @@
 import time
 import sys
-import os
 import random
 
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
+from ball_swarm import BallSwarm
+from frame_scheduler import FrameScheduler
+from terminal_renderer import ByteCounter, FrameRenderer
 
-def bouncing_ball():   
+def bouncing_ball(frames=None, out=None, rate=20):
     width = 40
     height = 10
     balls = [ '🏀', '🏐', '🎱', '⚾', '🥎', '🏈', '🏉', '🎾', '🥏']  # 10 different balls!
@@ -14,40 +14,91 @@ def bouncing_ball():
     x = random.randint(1, width-1)
     y = random.randint(1, height-1)
     dx = random.choice([-1, 1])
-    dy = random.choice([-1, 1]) 
-    
+    dy = random.choice([-1, 1])
+    screen = FrameRenderer(width + 1, height + 1, out=out)
+
+    def update():
+        nonlocal x, y, dx, dy, ball
+        # Update position
+        x += dx
+        y += dy
+
+        # Bounce off walls
+        if x <= 0 or x >= width:
+            dx = -dx
+            ball = random.choice(balls)  # Change ball on wall hit
+        if y <= 0 or y >= height:
+            dy = -dy
+            ball = random.choice(balls)  # Change ball on wall hit
+
+    def draw():
+        # Draw the ball (only changed cells reach the terminal)
+        screen.clear()
+        screen.put(y, x, ball)
+        screen.render()
+
+    return animate(update, draw, screen, rate, frames)
+
+def many_balls(n, width=40, height=10, collide=False, rate=20):
+    swarm = BallSwarm(n, width, height, collide=collide)
+    screen = FrameRenderer(width + 1, height + 1)
+
+    def draw():
+        swarm.draw(screen)
+        screen.render()
+
+    return animate(swarm.step, draw, screen, rate)
+
+def animate(update, draw, screen, rate, frames=None):
+    scheduler = FrameScheduler(rate)
+    if frames is None:
+        scheduler.stats.dump_at_exit()
     try:
-        while True:
-            clear_screen()
-            
-            # Update position
-            x += dx
-            y += dy
-            
-            # Bounce off walls
-            if x <= 0 or x >= width:
-                dx = -dx
-                ball = random.choice(balls)  # Change ball on wall hit
-            if y <= 0 or y >= height:
-                dy = -dy
-                ball = random.choice(balls)  # Change ball on wall hit
-            
-            # Draw the ball
-            for row in range(height + 1):
-                for col in range(width + 1):
-                    if row == y and col == x:
-                        print(ball, end='')
-                    else:
-                        print(' ', end='')
-                print()
-            
-            time.sleep(0.05)
-    
+        scheduler.run(update, draw, ticks=frames)
     except KeyboardInterrupt:
-        print("\nAnimation stopped!")
+        screen.close()
+        print("Animation stopped!")
         sys.exit(0)
+    return scheduler.stats
+
+def bench(frames):
+    counter = ByteCounter()
+    start = time.perf_counter()
+    bouncing_ball(frames, out=counter, rate=None)
+    elapsed = time.perf_counter() - start
+    print(f"{frames} frames in {elapsed:.3f}s: {frames / elapsed:,.0f} frames/sec, "
+          f"{counter.bytes / frames:.1f} bytes/frame")
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bouncing ball animation")
+    parser.add_argument("--bench", type=int, metavar="N",
+                        help="render N frames headless and report frames/sec")
+    parser.add_argument("--balls", type=int, default=1,
+                        help="number of balls (more than 1 uses the NumPy swarm)")
+    parser.add_argument("--width", type=int, default=40)
+    parser.add_argument("--height", type=int, default=10)
+    parser.add_argument("--collide", action="store_true",
+                        help="let the balls bounce off each other")
+    parser.add_argument("--headless", type=int, metavar="TICKS",
+                        help="simulate TICKS ticks without drawing, print timings")
+    parser.add_argument("--rate", type=float, default=20,
+                        help="ticks per second (0 = as fast as possible)")
+    args = parser.parse_args()
+
+    if args.bench:
+        bench(args.bench)
+        sys.exit(0)
+    if args.headless:
+        swarm = BallSwarm(args.balls, args.width, args.height, collide=args.collide)
+        stats = FrameScheduler(args.rate).run(swarm.step, ticks=args.headless)
+        stats.dump(sys.stdout)
+        print("Ball-ball collisions:", swarm.collisions)
+        sys.exit(0)
     print("Multi-Ball Animation - Press Ctrl+C to stop")
     time.sleep(1)
-    bouncing_ball()
\ No newline at end of file
+    if args.balls > 1:
+        many_balls(args.balls, args.width, args.height, args.collide, args.rate)
+    else:
+        bouncing_ball(rate=args.rate)
@@ -1,11 +1,20 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from classifier import PhraseClassifier
+
 p1 = "Make a lot of money"
 p2 = "Buy now"
 p3 = "Click here"
 p4 = "Subscribe this channel"
 
+# all phrases are checked in one pass over the message, ignoring case
+spam = PhraseClassifier({"spam": [p1, p2, p3, p4]})
+
 message = input("Enter the message: ")
 
-if((p1 in message) or (p2 in message) or (p3 in message) or (p4 in message)):
+if(spam.classify(message)):
     print("This is a spam message.")
 else:
-    print("This is not a spam message.")
\ No newline at end of file
+    print("This is not a spam message.")
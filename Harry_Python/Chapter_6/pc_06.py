@@ -1,7 +1,17 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from classifier import PhraseClassifier
+
+# case-insensitive matcher: "mahin", "MAHIN" and "Mahin" all match,
+# without making a lowercase copy of the post
+mentions = PhraseClassifier({"mention": ["Mahin"]})
+
 post = input("Enter your post: ")
 
-if("Mahin".lower() in post.lower()):  # here we use lower() method to convert the string into lowercase because if the user enter "mahin" instead of "Mahin" then it will also consider it as a match and print "This post is about mahin"
+if(mentions.classify(post)):
     print("This post is about mahin")
 
 else:
-    print("This post is not about mahin")
\ No newline at end of file
+    print("This post is not about mahin")
@@ -1,8 +1,12 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from primes import is_prime
+
 n = int(input("Enter a number: "))
 
-for i in range(2, n):
-    if(n%i) == 0:
-        print("Number isn't prime")
-        break
+if is_prime(n):
+    print("Number is prime")
 else:
-    print("Number is prime")
\ No newline at end of file
+    print("Number isn't prime")
@@ -1,8 +1,10 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from series import sum_to
+
 n =  int(input("Enter a number: "))
-i = 1
-sum = 0
-while i<=n :
-    sum +=i
-    i += 1
-    
-print("The sum is : ",sum)
\ No newline at end of file
+sum = sum_to(n)
+
+print("The sum is : ",sum)
@@ -1,7 +1,10 @@
-n = int(input("Enter a number: "))
-fact = 1
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from factorial import factorial
 
-for i in range (1, n+1):
-    fact *= i
+n = int(input("Enter a number: "))
+fact = factorial(n)
 
-print(f"The factorial of {n} is {fact}")
\ No newline at end of file
+print(f"The factorial of {n} is {fact}")
@@ -1,5 +1,9 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from series import sum_to
+
 def sum(n):
-    if n==1:
-        return 1
-    return sum(n-1) + n
-print(sum(4)) 
\ No newline at end of file
+    return sum_to(n)  # n*(n+1)//2, no recursion
+print(sum(4))
@@ -1,8 +1,8 @@
-def factorial(n):
-    if n == 1 or n == 0:
-        return 1
-    else:
-        return n * factorial(n-1)
-    
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from factorial import factorial  # recursion depth is only log2(n) here
+
 n=int(input("Enter a number: "))
-print(f"The factorial of {n} is {factorial(n)}") 
\ No newline at end of file
+print(f"The factorial of {n} is {factorial(n)}")
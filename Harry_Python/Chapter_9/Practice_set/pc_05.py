@@ -1,9 +1,11 @@
-word = "Donkey"
+import sys
+from pathlib import Path
 
-with open("file.txt", "r") as f:
-    content = f.read()
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+from aho_corasick import Automaton
+from censor import censor_file
 
-contentNew = content.replace(word, "######")
+word = "Donkey"
 
-with open("file.txt", "w") as f:
-    f.write(contentNew)
\ No newline at end of file
+# One streaming pass; file.txt is replaced in one atomic rename
+censor_file(Automaton([word]), "file.txt", b"######")
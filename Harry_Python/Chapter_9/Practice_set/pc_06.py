@@ -1,11 +1,12 @@
-word = ["Donkey", "Monkey", "Turkey"]
+import sys
+from pathlib import Path
 
-with open("file.txt", "r") as f:
-    content = f.read()
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+from aho_corasick import Automaton
+from censor import censor_file
 
-contentNew = content
-for w in word:
-    contentNew = contentNew.replace(w, "######")
+word = ["Donkey", "Monkey", "Turkey"]
 
-with open("file.txt", "w") as f:
-    f.write(contentNew)
\ No newline at end of file
+# All words are found in the same single pass (leftmost-longest matches),
+# in bounded chunks, and file.txt is replaced in one atomic rename
+censor_file(Automaton(word), "file.txt", b"######")
@@ -1,9 +1,12 @@
-line = 1
-with open('file.txt') as f:
-    line = f.readline()
+import sys
+from pathlib import Path
 
-    if("Donkey" in line):
-        print("Donkey is present in the file")
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+from keyword_search import search_file
 
-    else:
-        print("Donkey is not present in the file")
\ No newline at end of file
+# The whole file is searched in large binary blocks, not just its first line
+if search_file("file.txt", ["Donkey"]):
+    print("Donkey is present in the file")
+
+else:
+    print("Donkey is not present in the file")
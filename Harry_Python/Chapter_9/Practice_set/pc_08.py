@@ -1,12 +1,13 @@
+import sys
+from pathlib import Path
 
-with open('file.txt') as f:
-    line = f.readline()
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+from keyword_search import search_file
 
-lineno = 1
-for line in f:
-    lineno += 1
-    if("Donkey" in line):
-        print(f"Donkey is present in the file at line {lineno}")
+# Every occurrence with its line and column, found while the file is open
+hits = search_file("file.txt", ["Donkey"])
+for lineno, column, word in hits:
+    print(f"Donkey is present in the file at line {lineno}, column {column}")
 
-    else:
-        print("Donkey is not present in the file")
\ No newline at end of file
+if not hits:
+    print("Donkey is not present in the file")
@@ -15,6 +15,11 @@ from pydantic_ai.models.openai import OpenAIModel
 from pydantic import BaseModel
 from typing import Optional
 import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from expression import evaluate
  
 # -------------------------------------------------------
 # PART 1: সহজ Agent - সরাসরি কথা বলা
@@ -119,11 +124,12 @@ def get_current_time() -> str:
 @simple_agent.tool_plain  
 def calculate(expression: str) -> float:
     """Simple math calculation করো"""
-    # ⚠️ বাস্তবে eval() unsafe, শুধু example এর জন্য
-    allowed = set('0123456789+-*/.(). ')
-    if all(c in allowed for c in expression):
-        return eval(expression)
-    return 0.0
+    # eval() নয়: expression.py শুধু সংখ্যা, + - * / ** আর sqrt/sin এর মতো
+    # function allow করে, compile করা formula cache থাকে
+    try:
+        return float(evaluate(expression))
+    except (ValueError, TypeError, ZeroDivisionError, OverflowError, RecursionError):
+        return 0.0
 
 # -------------------------------------------------------
 # PART 5: Pydantic BaseModel - Data Validation দেখাই
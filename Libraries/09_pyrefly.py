@@ -124,6 +124,18 @@ student2 = Student("Karim", 21, [45.0, 50.0, 40.0, 55.0])
 print(student1.promote())
 print(student2.promote())
 
+# পুরো cohort একসাথে: cohort.py সব grade এক NumPy array তে রেখে
+# average/min/max আর promotion একবারে হিসাব করে
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from cohort import Cohort
+
+cohort = Cohort.from_students([student1, student2])
+cohort.report()
+print(cohort.summary())
+
 # -------------------------------------------------------
 # PART 5: Pyrefly vs অন্য Type Checkers
 # -------------------------------------------------------
@@ -1,14 +1,171 @@
-from vpython import *
+# 3D solar system
+#
+#   python S3D-Soalr_System.py                      -> the classic animation
+#   python S3D-Soalr_System.py --bench              -> startup / per-frame cost
+#   python S3D-Soalr_System.py --nbody              -> real gravity (nbody.py)
+#   python S3D-Soalr_System.py --nbody --headless --steps 5000 --out orbits.npy
+#                                                   -> no display, trajectory to disk
+#
+# vpython is only imported when something is actually shown.
 
-scene.background = color.black
+import argparse
+import os
+import sys
+import tempfile
+import time
 
-sun = sphere(pos=vector(0,0,0), radius=1, color=color.yellow)
-earth = sphere(pos=vector(3,0,0), radius=0.3, color=color.blue, make_tail= True)
-mars = sphere(pos=vector(5,0,0), radius=0.5, color=color.red, make_tail= True)
+import numpy as np
 
-t = 0
-while True:
-    rate(50)
-    earth.pos = vector(3*cos(t), 3*sin(t), 0)
-    mars.pos = vector(5*cos(t), 5*sin(t*0.8), 0)
-    t += 0.05
\ No newline at end of file
+from ephemeris import Ephemeris
+from frame_scheduler import FrameScheduler
+from nbody import NBody, random_disc, simulate
+
+SUN_GM = 27.0       # makes Earth (r = 3) go round at 1 radian per time unit
+MAX_SHOWN = 500     # bodies handed to vpython at most
+
+# (a, wx, b, wy): x = a*cos(wx*t), y = b*sin(wy*t) for Earth and Mars
+ORBITS = [(3, 1, 3, 1), (5, 1, 5, 0.8)]
+
+
+def classic():
+    from vpython import scene, sphere, vector, color, sleep
+
+    scene.background = color.black
+
+    sun = sphere(pos=vector(0,0,0), radius=1, color=color.yellow)
+    earth = sphere(pos=vector(3,0,0), radius=0.3, color=color.blue, make_tail= True)
+    mars = sphere(pos=vector(5,0,0), radius=0.5, color=color.red, make_tail= True)
+
+    # Positions come from a cached table instead of per-frame trig;
+    # one table sample per tick (t += ~0.05)
+    table = Ephemeris(ORBITS, dt=0.05).table.tolist()
+    tick = 0
+
+    def update():
+        nonlocal tick
+        tick += 1
+
+    def draw():
+        (ex, ey, ez), (mx, my, mz) = table[tick % len(table)]
+        earth.pos = vector(ex, ey, ez)
+        mars.pos = vector(mx, my, mz)
+
+    # 50 simulation ticks per second; sleep is vpython's, so the scene keeps updating
+    scheduler = FrameScheduler(tick_rate=50, sleep=sleep)
+    scheduler.stats.dump_at_exit()
+    scheduler.run(update, draw)
+
+
+def bench(frames=100_000):
+    """Compare per-frame trig with the ephemeris table (no display needed)."""
+    from math import cos, sin
+
+    start = time.perf_counter()
+    t = 0
+    for _ in range(frames):
+        earth = (3*cos(t), 3*sin(t), 0)
+        mars = (5*cos(t), 5*sin(t*0.8), 0)
+        t += 0.05
+    trig = (time.perf_counter() - start) / frames
+
+    cache_dir = os.path.join(tempfile.mkdtemp(), "ephemeris")
+    start = time.perf_counter()
+    table = Ephemeris(ORBITS, dt=0.05, cache_dir=cache_dir)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    table = Ephemeris(ORBITS, dt=0.05, cache_dir=cache_dir)
+    warm = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for tick in range(frames):
+        earth, mars = table.at(tick).tolist()
+    lookup = (time.perf_counter() - start) / frames
+
+    rows = table.table.tolist()     # what classic() indexes every frame
+    start = time.perf_counter()
+    for tick in range(frames):
+        earth, mars = rows[tick % len(rows)]
+    listed = (time.perf_counter() - start) / frames
+
+    start = time.perf_counter()
+    for tick in range(frames):
+        table.interpolate(tick * 0.05)
+    interp = (time.perf_counter() - start) / frames
+
+    print(f"startup: build+save {cold * 1e3:.2f} ms, cached load {warm * 1e3:.2f} ms "
+          f"({len(table)} samples, {table.table.nbytes} bytes)")
+    print(f"per frame: trig {trig * 1e6:.3f} us, table rows {listed * 1e6:.3f} us, "
+          f"table.at() {lookup * 1e6:.3f} us, interpolate() {interp * 1e6:.3f} us")
+
+
+def solar_system(extra_bodies=0, seed=None):
+    """Sun, Earth and Mars on circular orbits, plus optional asteroids."""
+    pos = [[0, 0, 0], [3, 0, 0], [5, 0, 0]]
+    vel = [[0, 0, 0], [0, (SUN_GM / 3) ** 0.5, 0], [0, (SUN_GM / 5) ** 0.5, 0]]
+    mass = [SUN_GM, 3e-6 * SUN_GM, 3e-7 * SUN_GM]
+    system = NBody(pos, vel, mass)
+    if extra_bodies:
+        p, v, m = random_disc(extra_bodies + 1, central_mass=SUN_GM, radius=8, seed=seed)
+        system = NBody(np.vstack((pos, p[1:])), np.vstack((vel, v[1:])),
+                       np.concatenate((mass, m[1:])))
+    return system
+
+
+def show(system, dt, steps_per_frame):
+    from vpython import scene, sphere, simple_sphere, vector, color, sleep
+
+    scene.background = color.black
+    looks = [(1, color.yellow), (0.3, color.blue), (0.5, color.red)]
+    balls = []
+    for i in range(min(len(system), MAX_SHOWN)):
+        radius, colour = looks[i] if i < len(looks) else (0.05, color.white)
+        make = sphere if i < len(looks) else simple_sphere
+        balls.append(make(pos=vector(*system.pos[i]), radius=radius, color=colour,
+                          make_trail=i < len(looks)))
+
+    def update():
+        for _ in range(steps_per_frame):
+            system.step(dt)
+
+    def draw():
+        for ball, (x, y, z) in zip(balls, system.pos[:len(balls)].tolist()):
+            ball.pos = vector(x, y, z)
+
+    scheduler = FrameScheduler(tick_rate=50, sleep=sleep)
+    scheduler.stats.dump_at_exit()
+    scheduler.run(update, draw)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="3D solar system")
+    parser.add_argument("--bench", action="store_true",
+                        help="measure startup and per-frame cost of the ephemeris")
+    parser.add_argument("--nbody", action="store_true",
+                        help="integrate real gravity instead of fixed circles")
+    parser.add_argument("--bodies", type=int, default=0,
+                        help="extra asteroids (Barnes-Hut kicks in above 2000 bodies)")
+    parser.add_argument("--dt", type=float, default=0.01)
+    parser.add_argument("--sample", type=int, default=5,
+                        help="integration steps per displayed / recorded frame")
+    parser.add_argument("--headless", action="store_true", help="don't open a display")
+    parser.add_argument("--steps", type=int, default=1000, help="steps for --headless")
+    parser.add_argument("--out", help="memory-mapped .npy trajectory for --headless")
+    args = parser.parse_args()
+
+    if args.bench:
+        bench()
+        sys.exit(0)
+    if not args.nbody:
+        classic()
+        sys.exit(0)
+
+    system = solar_system(args.bodies, seed=0)
+    if args.headless:
+        start = time.perf_counter()
+        traj = simulate(system, args.steps, args.dt, out=args.out, every=args.sample)
+        elapsed = time.perf_counter() - start
+        print(f"{len(system)} bodies, {args.steps} steps ({system.method}) in "
+              f"{elapsed:.2f}s, {len(traj)} frames"
+              + (f" written to {args.out}" if args.out else ""))
+    else:
+        show(system, args.dt, args.sample)
@@ -1,7 +1,24 @@
-from textblob import TextBlop
+# Spelling correction
+#
+#   python "Spelling Correction.py"                   -> TextBlob (pip install textblob)
+#   python "Spelling Correction.py" corpus.txt [text] -> offline, dictionary counted
+#                                                        from corpus.txt (symspell.py)
+import sys
 
-blop = TextBlop("Juss dee oit")
-corrected_blop = blop.correct()
+text = "Juss dee oit"
 
-print("Original Text:", blop)
-print("Corrected Text:", corrected_blop)
\ No newline at end of file
+if len(sys.argv) > 1:
+    from symspell import SymSpell
+
+    speller = SymSpell.for_corpus(sys.argv[1])
+    if len(sys.argv) > 2:
+        text = " ".join(sys.argv[2:])
+    corrected = speller.correct_text(text)
+else:
+    from textblob import TextBlob
+
+    blob = TextBlob(text)
+    corrected = blob.correct()
+
+print("Original Text:", text)
+print("Corrected Text:", corrected)
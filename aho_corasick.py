@@ -0,0 +1,170 @@
+# Aho-Corasick multi-keyword matching over bytes
+#
+# One automaton finds every occurrence of any number of keywords in a
+# single pass over the data, instead of one str.replace() / "in" test per
+# keyword. It is built once from the keyword list, can be saved with
+# marshal (loading is a couple of C calls, no rebuilding), and scanning
+# can stop and resume at any byte, so data can be fed in chunks.
+#
+# The trie + failure links are compiled into a full DFA over byte
+# classes: every byte that occurs in a keyword gets its own class, all
+# other bytes share class 0, and bytes.translate() maps the input to
+# classes at C speed. The scan loop is then one array lookup per byte.
+# States are numbered so that the ones where a keyword ends come last,
+# which makes "did anything match here?" a single comparison.
+
+import marshal
+from array import array
+from collections import deque
+
+VERSION = 2
+
+
+class Automaton:
+    def __init__(self, keywords=(), ignore_case=False):
+        """keywords: str (UTF-8 encoded) or bytes; ignore_case folds ASCII letters."""
+        self.ignore_case = ignore_case
+        self.keywords = []
+        seen = set()
+        for keyword in keywords:
+            if isinstance(keyword, str):
+                keyword = keyword.encode()
+            if ignore_case:
+                keyword = keyword.lower()
+            if keyword and keyword not in seen:
+                seen.add(keyword)
+                self.keywords.append(keyword)
+        self._compile()
+
+    def _compile(self):
+        alphabet = sorted(set(b"".join(self.keywords)))
+        table = bytearray(256)
+        for cls, byte in enumerate(alphabet, 1):
+            table[byte] = cls
+        if self.ignore_case:
+            for byte in range(ord("A"), ord("Z") + 1):
+                table[byte] = table[byte + 32]
+        width = len(alphabet) + 1
+
+        # trie over classes
+        goto = [{}]
+        own = [None]
+        for k, keyword in enumerate(self.keywords):
+            state = 0
+            for cls in keyword.translate(table):
+                nxt = goto[state].get(cls)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][cls] = nxt
+                    goto.append({})
+                    own.append(None)
+                state = nxt
+            own[state] = k
+
+        # full transition rows and outputs, breadth first
+        delta = [None] * len(goto)
+        out = [()] * len(goto)
+        delta[0] = [goto[0].get(cls, 0) for cls in range(width)]
+        queue = deque()
+        for child in goto[0].values():
+            out[child] = (own[child],) if own[child] is not None else ()
+            queue.append((child, 0))
+        while queue:
+            state, fail = queue.popleft()
+            row = list(delta[fail])
+            for cls, child in goto[state].items():
+                row[cls] = child
+                child_fail = delta[fail][cls]
+                mine = (own[child],) if own[child] is not None else ()
+                out[child] = mine + out[child_fail]
+                queue.append((child, child_fail))
+            delta[state] = row
+
+        # renumber: states without output first, then final states
+        order = [s for s in range(len(goto)) if not out[s]] + [s for s in range(len(goto)) if out[s]]
+        new = [0] * len(goto)
+        for i, s in enumerate(order):
+            new[s] = i
+        flat = array("q")
+        for s in order:
+            flat.extend(new[t] * width for t in delta[s])
+        self.classes = bytes(table)
+        self.width = width
+        self.delta = flat
+        self.first_final = (len(goto) - sum(1 for o in out if o)) * width
+        self.out = [out[s] for s in order if out[s]]
+        self.lengths = [len(k) for k in self.keywords]
+        self.maxlen = max(self.lengths, default=0)
+
+    def __len__(self):
+        return len(self.keywords)
+
+    # -- saving and loading ---------------------------------------------
+
+    def dumps(self):
+        return marshal.dumps((VERSION, self.ignore_case, self.keywords, self.classes,
+                              self.width, self.delta.tobytes(), self.first_final, self.out))
+
+    @classmethod
+    def loads(cls, data):
+        fields = marshal.loads(data)
+        if fields[0] != VERSION:
+            raise ValueError(f"automaton format {fields[0]}, expected {VERSION}")
+        automaton = cls.__new__(cls)
+        (_, automaton.ignore_case, automaton.keywords, automaton.classes,
+         automaton.width, delta, automaton.first_final, automaton.out) = fields
+        automaton.delta = array("q")
+        automaton.delta.frombytes(delta)
+        automaton.lengths = [len(k) for k in automaton.keywords]
+        automaton.maxlen = max(automaton.lengths, default=0)
+        return automaton
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.dumps())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.loads(f.read())
+
+    # -- scanning -------------------------------------------------------
+
+    def scan(self, data, state=0):
+        """Every match in data as (end, keyword id), end exclusive.
+
+        Returns (matches, state); pass the state to the next call to
+        continue a stream (a match may then end in a later chunk).
+        """
+        delta, final, out, width = self.delta, self.first_final, self.out, self.width
+        matches = []
+        for i, cls in enumerate(data.translate(self.classes), 1):
+            state = delta[state + cls]
+            if state >= final:
+                for keyword in out[(state - final) // width]:
+                    matches.append((i, keyword))
+        return matches, state
+
+    def find_all(self, data):
+        """Leftmost-longest, non-overlapping matches as (start, end, keyword id)."""
+        matches, _ = self.scan(data)
+        return select(matches, self.lengths)
+
+    def hits(self, data):
+        """Set of keyword ids occurring anywhere in data (overlaps included)."""
+        return {k for _, k in self.scan(data)[0]}
+
+
+def select(matches, lengths, start=0):
+    """Leftmost-longest, non-overlapping (start, end, id) from scan() matches.
+
+    Matches starting before `start` (already covered) are skipped.
+    """
+    spans = sorted(((end - lengths[k], -lengths[k], k) for end, k in matches))
+    chosen = []
+    cursor = start
+    for begin, neg_len, k in spans:
+        if begin >= cursor:
+            chosen.append((begin, begin - neg_len, k))
+            cursor = begin - neg_len
+    return chosen
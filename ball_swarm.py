@@ -0,0 +1,121 @@
+# Many bouncing balls at once, with NumPy
+#
+# Positions and velocities live in (n, 2) arrays (columns are x, y), so a
+# tick is a handful of array operations no matter how many balls there
+# are. Ball-ball collisions use a uniform grid: each ball is only compared
+# with balls in its own and neighbouring cells, not with every other ball.
+
+import numpy as np
+
+BALLS = ['🏀', '🏐', '🎱', '⚾', '🥎', '🏈', '🏉', '🎾', '🥏']
+
+# Half of the 3x3 neighbourhood, so every pair of cells is visited once
+_NEIGHBOURS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+
+class BallSwarm:
+    """n balls bouncing inside a width x height box (same units as the grid)."""
+
+    def __init__(self, n, width, height, speed=1.0, radius=0.5,
+                 collide=False, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.size = np.array([width, height], dtype=np.float64)
+        self.radius = radius
+        self.collide = collide
+        self.pos = radius + self.rng.random((n, 2)) * (self.size - 2 * radius)
+        angle = self.rng.uniform(0, 2 * np.pi, n)
+        self.vel = speed * np.column_stack((np.cos(angle), np.sin(angle)))
+        self.kind = self.rng.integers(0, len(BALLS), n)
+        self.collisions = 0
+
+    def __len__(self):
+        return len(self.pos)
+
+    def step(self, dt=1.0):
+        pos, vel = self.pos, self.vel
+        pos += vel * dt
+
+        # Wall bounces: reflect the position back inside and flip velocity
+        low = pos < 0
+        high = pos > self.size
+        pos[low] = -pos[low]
+        pos[high] = (2 * self.size - pos)[high]
+        hit = low | high
+        vel[hit] = -vel[hit]
+        np.clip(pos, 0, self.size, out=pos)
+
+        bounced = hit.any(axis=1)
+        self.kind[bounced] = self.rng.integers(0, len(BALLS), bounced.sum())
+
+        if self.collide:
+            self._collide()
+
+    def _candidate_pairs(self):
+        """Return index arrays (i, j) of balls in the same or adjacent cells."""
+        cell = 2 * self.radius
+        ij = np.floor(self.pos / cell).astype(np.int64)
+        rows = int(ij[:, 1].max()) + 3
+        key = (ij[:, 0] + 1) * rows + (ij[:, 1] + 1)
+        order = np.argsort(key, kind="stable")
+        sorted_key = key[order]
+
+        firsts, seconds = [], []
+        for ox, oy in _NEIGHBOURS:
+            target = key + ox * rows + oy
+            lo = np.searchsorted(sorted_key, target, "left")
+            hi = np.searchsorted(sorted_key, target, "right")
+            counts = hi - lo
+            if not counts.any():
+                continue
+            i = np.repeat(np.arange(len(key)), counts)
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            j = order[np.repeat(lo, counts) + offsets]
+            if (ox, oy) == (0, 0):
+                keep = i < j
+                i, j = i[keep], j[keep]
+            firsts.append(i)
+            seconds.append(j)
+        if not firsts:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        return np.concatenate(firsts), np.concatenate(seconds)
+
+    def _collide(self, passes=16):
+        """Resolve every approaching contact, in rounds of disjoint pairs.
+
+        Each round applies one elastic impulse to a set of pairs that share
+        no ball, then re-checks the rest with the new velocities, so a ball
+        touching several others is handled one contact at a time and energy
+        is conserved. Stops when nothing approaches any more, or after
+        `passes` rounds in very crowded scenes.
+        """
+        i, j = self._candidate_pairs()
+        delta = self.pos[i] - self.pos[j]
+        dist2 = np.einsum("ij,ij->i", delta, delta)
+        close = (dist2 < (2 * self.radius) ** 2) & (dist2 > 0)
+        i, j, delta, dist2 = i[close], j[close], delta[close], dist2[close]
+        for _ in range(passes):
+            rel = self.vel[i] - self.vel[j]
+            approach = np.einsum("ij,ij->i", rel, delta)
+            active = np.flatnonzero(approach < 0)
+            if not len(active):
+                return
+            # keep pairs where both balls appear for the first time: no ball
+            # is in two of them, and the first active pair is always kept
+            ends = np.column_stack((i[active], j[active])).ravel()
+            first = np.zeros(len(ends), dtype=bool)
+            first[np.unique(ends, return_index=True)[1]] = True
+            pick = active[first.reshape(-1, 2).all(axis=1)]
+            # Equal-mass elastic collision: swap the velocity along the normal
+            impulse = (approach[pick] / dist2[pick])[:, None] * delta[pick]
+            self.vel[i[pick]] -= impulse
+            self.vel[j[pick]] += impulse
+            self.collisions += len(pick)
+
+    def draw(self, screen):
+        """Put every ball on a terminal_renderer.FrameRenderer."""
+        cells = np.rint(self.pos).astype(np.int64)
+        screen.clear()
+        for (x, y), k in zip(cells.tolist(), self.kind.tolist()):
+            screen.put(y, x, BALLS[k])
+
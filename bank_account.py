@@ -1,27 +1,54 @@
 # Bank Account system with deposit & withdraw
+#
+# Pass a ledger.Ledger to keep a durable, append-only history of every
+# accepted transaction (see ledger.py for batch processing). Each operation
+# is committed before it returns, and an account found in the ledger after
+# a restart takes its balance from there. For many
+# accounts shared between threads see concurrent_bank.py.
+
+import threading
 
 class BankAccount:
-    def __init__(self, name, balance):
+    def __init__(self, name, balance, ledger=None):
         self.name = name
         self.balance = balance
+        self.ledger = ledger
+        self.lock = threading.Lock()  # makes check-then-act in withdraw atomic
+        if ledger is not None:
+            self.account_id = ledger.open_account(name, balance)
+            self.balance = ledger.balance(self.account_id)
 
     def deposit(self, amount):
-        self.balance += amount
-        print("Deposited:", amount)
+        with self.lock:
+            ok = True
+            if self.ledger is not None:
+                ok = self.ledger.deposit(self.account_id, amount)
+                self.ledger.commit()
+            if ok:
+                self.balance += amount
+        if ok:
+            print("Deposited:", amount)
 
     def withdraw(self, amount):
-        if amount > self.balance:
+        with self.lock:
+            ok = amount <= self.balance
+            if ok and self.ledger is not None:
+                ok = self.ledger.withdraw(self.account_id, amount)
+                self.ledger.commit()
+            if ok:
+                self.balance -= amount
+        if not ok:
             print("Insufficient balance!")
         else:
-            self.balance -= amount
             print("Withdrawn:", amount)
 
     def show_balance(self):
         print("Current Balance:", self.balance)
 
 
-# object create
-acc = BankAccount("Mahin", 1000)
-acc.deposit(500)
-acc.withdraw(300)
-acc.show_balance()
+if __name__ == "__main__":
+    # object create
+    acc = BankAccount("Mahin", 1000)
+    acc.deposit(500)
+    acc.withdraw(300)
+    acc.show_balance()
@@ -1,5 +1,8 @@
 # Simple Calculator using OOP
 
+from expression import evaluate
+
+
 class Calculator:
     def __init__(self, a, b):
         self.a = a
@@ -11,8 +14,18 @@ class Calculator:
     def subtract(self):
         return self.a - self.b
 
-# object create
-calc = Calculator(10, 5) 
+    def evaluate(self, formula):
+        """Any arithmetic formula of a and b, e.g. "(a + b) ** 2 / a".
+
+        a and b may also be NumPy arrays to compute many results at once.
+        """
+        return evaluate(formula, a=self.a, b=self.b)
+
+
+if __name__ == "__main__":
+    # object create
+    calc = Calculator(10, 5) 
 
-print("Addition:", calc.add()) 
-print("Subtraction:", calc.subtract()) 
+    print("Addition:", calc.add()) 
+    print("Subtraction:", calc.subtract()) 
+    print("(a + b) ** 2 / a:", calc.evaluate("(a + b) ** 2 / a"))
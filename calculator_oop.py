@@ -1,3 +1,6 @@
+from expression import evaluate
+
+
 class Calculator:
     def __init__(self, x, y):
         self.x = x
@@ -12,7 +15,14 @@ class Calculator:
     def mul(self):
         print("Mul:", self.x * self.y)
 
-c = Calculator(10, 5)
-c.add()
-c.sub()
-c.mul()
+    def calc(self, formula):
+        """Evaluate a formula of x and y, e.g. "x * y - x / y"."""
+        print(f"{formula}:", evaluate(formula, x=self.x, y=self.y))
+
+
+if __name__ == "__main__":
+    c = Calculator(10, 5)
+    c.add()
+    c.sub()
+    c.mul()
+    c.calc("x * y - x / y")
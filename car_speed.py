@@ -21,9 +21,10 @@ class Car:
         print("Car:", self.brand, "| Speed:", self.speed)
 
 
-# object create
-c1 = Car("Toyota")
-c1.accelerate()
-c1.accelerate()
-c1.brake()
-c1.show()
+if __name__ == "__main__":
+    # object create
+    c1 = Car("Toyota")
+    c1.accelerate()
+    c1.accelerate()
+    c1.brake()
+    c1.show()
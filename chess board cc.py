@@ -28,4 +28,5 @@ def plot_chessboard( size = 8 ):
     plt.title("Chessboard", fontsize=16, fontweight='bold')
     plt.show()
 
-plot_chessboard(8) 
+if __name__ == "__main__":
+    plot_chessboard(8)
@@ -13,4 +13,5 @@ def plot_checkboard(size=8):
 
     plt.show()
     
-plot_checkboard(8)   
+if __name__ == "__main__":
+    plot_checkboard(8)
@@ -0,0 +1,182 @@
+# Batch, headless chessboard image rendering
+#
+# The chess board scripts draw one board with plt.show(). For data sets of
+# thousands of boards this module renders straight to PNG files:
+#
+#   * BoardRenderer keeps one Agg figure and one image artist per process
+#     and only swaps the pixel data (set_data) for each board.
+#   * rasterize() + write_png() skip matplotlib entirely for plain boards.
+#   * render_batch() spreads the boards over a process pool.
+
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_PALETTE = ("#f0d9b5", "#b58863")
+
+
+@dataclass
+class Board:
+    path: str
+    size: int = 8
+    palette: Tuple[str, str] = DEFAULT_PALETTE
+    highlights: List[Tuple[int, int]] = field(default_factory=list)   # (row, col)
+    highlight_color: str = "#f6f669"
+    title: Optional[str] = "Chessboard"
+
+
+def hex_to_rgb(color):
+    color = color.lstrip("#")
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def board_pixels(board):
+    """One RGB pixel per square, (size, size, 3) uint8."""
+    colors = np.array([hex_to_rgb(c) for c in board.palette], dtype=np.uint8)
+    pixels = colors[np.indices((board.size, board.size)).sum(axis=0) % 2]
+    if board.highlights:
+        rows, cols = np.array(board.highlights).T
+        pixels[rows, cols] = hex_to_rgb(board.highlight_color)
+    return pixels
+
+
+def rasterize(board, square_px=32):
+    """Full-resolution plain board: every square is square_px x square_px."""
+    pixels = board_pixels(board)
+    return np.repeat(np.repeat(pixels, square_px, axis=0), square_px, axis=1)
+
+
+def write_png(path, rgb):
+    """Write an (h, w, 3) uint8 array as a PNG with only the standard library."""
+    h, w, _ = rgb.shape
+    raw = np.empty((h, 1 + 3 * w), dtype=np.uint8)
+    raw[:, 0] = 0                               # filter type "None" per row
+    raw[:, 1:] = rgb.reshape(h, -1)
+
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)))
+        f.write(chunk(b"IEND", b""))
+
+
+class BoardRenderer:
+    """One reusable Agg figure that only repaints the board image.
+
+    Labels, grid and title are drawn by a full draw only when the board
+    size or title changes; otherwise just the image artist (and the grid
+    lines on top of it) are repainted onto the existing canvas.
+    """
+
+    def __init__(self, figsize=(6, 6), dpi=100):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot()
+        self.image = self.ax.imshow(np.zeros((1, 1, 3), dtype=np.uint8),
+                                    interpolation="nearest")
+        self.ax.tick_params(which="major", bottom=False, left=False)
+        self.title = self.ax.set_title("", fontsize=16, fontweight="bold")
+        self.layout = None
+
+    def _relayout(self, size, title):
+        ax = self.ax
+        self.image.set_extent((-0.5, size - 0.5, size - 0.5, -0.5))
+        ax.set_xticks(np.arange(size))
+        ax.set_yticks(np.arange(size))
+        ax.set_xticklabels([chr(ord('A') + i) for i in range(size)])
+        ax.set_yticklabels([str(size - i) for i in range(size)])
+        ax.set_xticks(np.arange(-0.5, size, 1), minor=True)
+        ax.set_yticks(np.arange(-0.5, size, 1), minor=True)
+        ax.grid(which="minor", color="black", linewidth=1)
+        ax.tick_params(which="minor", bottom=False, left=False)
+        self.title.set_text(title)
+        self.canvas.draw()
+        self.gridlines = [tick.gridline for tick in
+                          ax.xaxis.get_minor_ticks() + ax.yaxis.get_minor_ticks()]
+        self.layout = (size, title)
+
+    def render(self, board):
+        self.image.set_data(board_pixels(board))
+        layout = (board.size, board.title or "")
+        if layout != self.layout:
+            self._relayout(*layout)
+        else:
+            self.ax.draw_artist(self.image)
+            for line in self.gridlines:
+                self.ax.draw_artist(line)
+        rgba = np.asarray(self.canvas.buffer_rgba())
+        write_png(board.path, rgba[:, :, :3])
+        return board.path
+
+
+def plain(board):
+    """Plain boards (no title) don't need matplotlib at all."""
+    return not board.title
+
+
+_renderer = None
+
+
+def render_one(board, square_px=32):
+    global _renderer
+    if plain(board):
+        write_png(board.path, rasterize(board, square_px))
+        return board.path
+    if _renderer is None:
+        _renderer = BoardRenderer()
+    return _renderer.render(board)
+
+
+def _render_chunk(boards):
+    return [render_one(b) for b in boards]
+
+
+def render_batch(boards, processes=None, chunk_size=64):
+    """Render every Board to its PNG path; returns the list of paths."""
+    boards = list(boards)
+    if processes == 1:
+        return _render_chunk(boards)
+    chunks = [boards[i:i + chunk_size] for i in range(0, len(boards), chunk_size)]
+    with ProcessPoolExecutor(processes) as pool:
+        return [path for paths in pool.map(_render_chunk, chunks) for path in paths]
+
+
+if __name__ == "__main__":
+    import argparse
+    import random
+
+    parser = argparse.ArgumentParser(description="Render many chessboards to PNG")
+    parser.add_argument("count", type=int)
+    parser.add_argument("outdir")
+    parser.add_argument("--plain", action="store_true",
+                        help="no title/labels: use the pure NumPy rasterizer")
+    parser.add_argument("--processes", type=int)
+    args = parser.parse_args()
+
+    os.makedirs(args.outdir, exist_ok=True)
+    palettes = [DEFAULT_PALETTE, ("#eeeed2", "#769656"), ("#ffffff", "#000000")]
+    rng = random.Random(0)
+    boards = []
+    for i in range(args.count):
+        size = rng.choice([6, 8, 10, 12])
+        highlights = [(rng.randrange(size), rng.randrange(size)) for _ in range(3)]
+        boards.append(Board(os.path.join(args.outdir, f"board_{i:06d}.png"), size,
+                            rng.choice(palettes), highlights,
+                            title=None if args.plain else "Chessboard"))
+    start = time.perf_counter()
+    render_batch(boards, args.processes)
+    elapsed = time.perf_counter() - start
+    print(f"{args.count} boards in {elapsed:.2f}s ({args.count / elapsed:,.0f} boards/sec)")
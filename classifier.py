@@ -0,0 +1,256 @@
+# Batched phrase classifier (spam phrases, watched names, ...)
+#
+# Chapter_6/pc_03.py tests a message with four "phrase in message" checks
+# and pc_06.py lowercases the whole post to look for one name. With
+# thousands of phrases and millions of posts, PhraseClassifier compiles
+# every phrase of every label into one case-insensitive Aho-Corasick
+# automaton, so each message is scanned once whatever the number of
+# phrases, and reports which phrases of which labels it contains.
+#
+#   python classifier.py --phrases spam=spam.txt --phrases mention=names.txt posts.jsonl
+#   cat posts.txt | python classifier.py -           (one message per line)
+#
+# Batches are classified in-process or spread over worker processes;
+# every run reports messages/sec and per-message latency percentiles.
+
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from aho_corasick import Automaton
+
+SPAM = ["Make a lot of money", "Buy now", "Click here", "Subscribe this channel"]
+CHUNK_SIZE = 2_000
+
+
+class PhraseClassifier:
+    def __init__(self, labels):
+        """labels: {label: [phrase, ...]}; matching ignores ASCII case."""
+        phrases = {}
+        original = {}
+        for label, items in labels.items():
+            for phrase in items:
+                text = phrase if isinstance(phrase, str) else phrase.decode(errors="replace")
+                key = text.encode().lower()
+                phrases.setdefault(key, []).append(label)
+                original.setdefault(key, text)
+        self.automaton = Automaton(phrases, ignore_case=True)
+        self.labels = [phrases[k] for k in self.automaton.keywords]
+        self.texts = [original[k] for k in self.automaton.keywords]
+
+    def classify(self, message):
+        """{label: sorted matched phrases} for one message (empty if clean)."""
+        if message is None:
+            message = b""
+        elif not isinstance(message, (str, bytes)):
+            message = str(message)
+        if isinstance(message, str):
+            message = message.encode()
+        hits = {}
+        for k in self.automaton.hits(message):
+            for label in self.labels[k]:
+                hits.setdefault(label, []).append(self.texts[k])
+        for found in hits.values():
+            found.sort()
+        return hits
+
+    def classify_batch(self, messages):
+        """(hits per message, latency per message in seconds)."""
+        results, latencies = [], []
+        clock = time.perf_counter
+        for message in messages:
+            start = clock()
+            results.append(self.classify(message))
+            latencies.append(clock() - start)
+        return results, latencies
+
+    def dumps(self):
+        return self.automaton.dumps(), self.labels, self.texts
+
+    @classmethod
+    def loads(cls, state):
+        blob, labels, texts = state
+        classifier = cls.__new__(cls)
+        classifier.automaton = Automaton.loads(blob)
+        classifier.labels, classifier.texts = labels, texts
+        return classifier
+
+
+class BatchStats:
+    def __init__(self):
+        self.messages = 0
+        self.flagged = 0
+        self.latencies = []
+        self.started = time.perf_counter()
+
+    def add(self, results, latencies):
+        self.messages += len(results)
+        self.flagged += sum(1 for r in results if r)
+        self.latencies.extend(latencies)
+
+    def percentiles(self, qs=(50, 99)):
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return {q: 0.0 for q in qs}
+        return {q: ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] for q in qs}
+
+    def summary(self):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        p = self.percentiles()
+        return (f"{self.messages:,} messages ({self.flagged:,} flagged) in {elapsed:.2f}s, "
+                f"{self.messages / elapsed:,.0f} msgs/sec, "
+                f"latency p50 {p[50] * 1e6:.1f} us, p99 {p[99] * 1e6:.1f} us")
+
+
+# -- worker processes: the classifier is sent once per worker ----------------
+
+_worker = None
+
+
+def _init_worker(state):
+    global _worker
+    _worker = PhraseClassifier.loads(state)
+
+
+def _classify_chunk(messages):
+    return _worker.classify_batch(messages)
+
+
+def classify_stream(classifier, messages, processes=1, chunk_size=CHUNK_SIZE, stats=None):
+    """Yield (message, hits) in input order; latencies go into stats.
+
+    processes=1 runs in the calling process; otherwise chunks go to a pool
+    with at most two chunks per worker in flight.
+    """
+    messages = iter(messages)
+    chunks = iter(lambda: list(islice(messages, chunk_size)), [])
+    stats = stats if stats is not None else BatchStats()
+    if processes == 1:
+        for chunk in chunks:
+            results, latencies = classifier.classify_batch(chunk)
+            stats.add(results, latencies)
+            yield from zip(chunk, results)
+        return
+    workers = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(classifier.dumps(),)) as pool:
+        pending = deque()
+
+        def finish():
+            chunk, future = pending.popleft()
+            results, latencies = future.result()
+            stats.add(results, latencies)
+            return zip(chunk, results)
+
+        for chunk in chunks:
+            pending.append((chunk, pool.submit(_classify_chunk, chunk)))
+            if len(pending) >= 2 * workers:
+                yield from finish()
+        while pending:
+            yield from finish()
+
+
+def read_messages(path, field="text"):
+    """Messages from a JSONL file (field `field`) or a text file, one per line.
+
+    A line starting with "{" that is not valid JSON is taken as text; a
+    missing or null field gives "", other non-string values their str().
+    """
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8", errors="replace")
+    try:
+        for line in f:
+            line = line.rstrip("\n")
+            if line.startswith("{"):
+                try:
+                    value = json.loads(line).get(field)
+                except json.JSONDecodeError:
+                    yield line
+                    continue
+                yield "" if value is None else value if isinstance(value, str) else str(value)
+            elif line:
+                yield line
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def load_labels(specs):
+    """["spam=spam.txt", ...] -> {"spam": [phrases]}; one phrase per line."""
+    labels = {}
+    for spec in specs:
+        label, _, path = spec.partition("=")
+        with open(path, encoding="utf-8") as f:
+            labels.setdefault(label, []).extend(line.strip() for line in f if line.strip())
+    return labels
+
+
+def benchmark(messages=200_000, phrases=5_000, processes=(1, None), seed=0):
+    import random
+
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    spam = SPAM + [" ".join("".join(rng.choices(letters, k=rng.randint(4, 8)))
+                            for _ in range(rng.randint(2, 3))) for _ in range(phrases)]
+    names = ["Mahin"] + ["".join(rng.choices(letters, k=rng.randint(4, 9))).title()
+                         for _ in range(phrases // 5)]
+    vocabulary = ["".join(rng.choices(letters, k=rng.randint(2, 9))) for _ in range(20_000)]
+    posts = []
+    for _ in range(messages):
+        words = rng.choices(vocabulary, k=rng.randint(5, 40))
+        if rng.random() < 0.05:
+            words.insert(rng.randrange(len(words)), rng.choice(spam).upper())
+        if rng.random() < 0.05:
+            words.append(rng.choice(names))
+        posts.append(" ".join(words))
+
+    start = time.perf_counter()
+    classifier = PhraseClassifier({"spam": spam, "mention": names})
+    print(f"{len(spam) + len(names):,} phrases compiled in {time.perf_counter() - start:.2f}s")
+
+    sample = posts[:2_000]
+    lowered = [p.lower() for p in spam + names]
+    start = time.perf_counter()
+    for post in sample:
+        low = post.lower()
+        any(p in low for p in lowered)
+    print(f"'phrase in message' per phrase: "
+          f"{len(sample) / (time.perf_counter() - start):,.0f} msgs/sec")
+
+    for workers in processes:
+        stats = BatchStats()
+        for _ in classify_stream(classifier, posts, workers, stats=stats):
+            pass
+        print(f"processes={workers or os.cpu_count()}: {stats.summary()}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Flag messages containing watched phrases")
+    parser.add_argument("inputs", nargs="*", help='JSONL or text files ("-" = stdin)')
+    parser.add_argument("--phrases", action="append", default=[], metavar="LABEL=FILE",
+                        help="phrases for a label, one per line (repeatable)")
+    parser.add_argument("--field", default="text", help="JSONL field holding the message")
+    parser.add_argument("-p", "--processes", type=int, default=1,
+                        help="worker processes (0 = one per CPU)")
+    parser.add_argument("--all", action="store_true", help="also print clean messages")
+    parser.add_argument("--bench", action="store_true")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark()
+    else:
+        labels = load_labels(args.phrases) or {"spam": SPAM, "mention": ["Mahin"]}
+        classifier = PhraseClassifier(labels)
+        stats = BatchStats()
+        messages = (m for path in args.inputs or ["-"] for m in read_messages(path, args.field))
+        out = sys.stdout
+        for i, (message, hits) in enumerate(classify_stream(
+                classifier, messages, args.processes or None, stats=stats)):
+            if hits or args.all:
+                out.write(json.dumps({"index": i, "hits": hits, "text": message}) + "\n")
+        print(stats.summary(), file=sys.stderr)
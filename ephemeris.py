@@ -0,0 +1,85 @@
+# Precomputed ephemeris tables for the solar-system animation
+#
+# Each orbit is x = a*cos(wx*t), y = b*sin(wy*t), z = 0 (the paths used by
+# S3D-Soalr_System.py). Positions are computed once at a fixed time step
+# over one common period, stored as a compact float32 (samples, bodies, 3)
+# array and cached on disk under a key made from the orbital parameters,
+# so a restart just memory-maps the file instead of redoing the trig.
+
+import hashlib
+import math
+import os
+from fractions import Fraction
+
+import numpy as np
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ephemeris")
+
+
+def common_period(orbits, max_denominator=1000):
+    """Smallest time after which every orbit is back at its start."""
+    # Each axis repeats every 2*pi/w; the lcm of fractions p/q is lcm(p)/gcd(q)
+    ratios = [Fraction(1 / w).limit_denominator(max_denominator)
+              for _, wx, _, wy in orbits for w in (wx, wy) if w]
+    if not ratios:
+        return 2 * math.pi
+    num = math.lcm(*(r.numerator for r in ratios))
+    den = math.gcd(*(r.denominator for r in ratios))
+    return 2 * math.pi * num / den
+
+
+class Ephemeris:
+    """Positions of `orbits` = [(a, wx, b, wy), ...] sampled about every dt.
+
+    dt is nudged so that a whole number of samples spans one period, which
+    lets the table wrap around seamlessly.
+    """
+
+    def __init__(self, orbits, dt=0.05, cache_dir=CACHE_DIR):
+        self.orbits = [tuple(map(float, o)) for o in orbits]
+        self.period = common_period(self.orbits)
+        self.samples = max(1, int(round(self.period / dt)))
+        self.dt = self.period / self.samples
+        self.loaded = False
+        self.path = None
+        if cache_dir:
+            self.path = os.path.join(cache_dir, self.key() + ".npy")
+            if os.path.exists(self.path):
+                self.table = np.load(self.path, mmap_mode="r")
+                self.loaded = True
+                return
+        self.table = self._compute()
+        if self.path:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = self.path + f".{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, self.table)
+            os.replace(tmp, self.path)
+
+    def key(self):
+        text = repr((self.orbits, self.dt, self.samples, "float32"))
+        return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+    def _compute(self):
+        t = np.arange(self.samples) * self.dt
+        table = np.zeros((self.samples, len(self.orbits), 3), dtype=np.float32)
+        for j, (a, wx, b, wy) in enumerate(self.orbits):
+            table[:, j, 0] = a * np.cos(wx * t)
+            table[:, j, 1] = b * np.sin(wy * t)
+        return table
+
+    def __len__(self):
+        return self.samples
+
+    def at(self, index):
+        """Positions (bodies, 3) at sample `index` (wraps around the period)."""
+        return self.table[index % self.samples]
+
+    def interpolate(self, t):
+        """Positions at time t, linearly interpolated between samples."""
+        x = (t % self.period) / self.dt
+        i = int(x)
+        frac = x - i
+        p0 = self.table[i % self.samples]
+        p1 = self.table[(i + 1) % self.samples]
+        return p0 + (p1 - p0) * np.float32(frac)
@@ -0,0 +1,190 @@
+# Safe, compiled arithmetic expressions
+#
+# An expression such as "a * (b + 2) ** 2 / sqrt(c)" is parsed once with
+# the ast module, checked against a small whitelist (numbers, variables,
+# + - * / // % **, unary +/-, a few math functions) and turned into nested
+# Python closures. Compiled expressions are cached by source text, and the
+# closures work unchanged on NumPy arrays, so one formula can be evaluated
+# over millions of rows at once. Nothing ever goes through eval().
+
+import ast
+import math
+import operator
+from functools import lru_cache
+
+import numpy as np
+
+MAX_INT_BITS = 100_000          # stops things like 9**9**9 or (10**10000)**10000 from hanging
+
+def _check_bits(bits):
+    if bits > MAX_INT_BITS:
+        raise ValueError(f"result would have about {bits:,} bits, the limit is {MAX_INT_BITS:,}")
+
+
+def _power(a, b):
+    if isinstance(a, int) and isinstance(b, int) and b > 0 and abs(a) > 1:
+        _check_bits((abs(a).bit_length() - 1) * b + 1)
+    return a ** b
+
+
+def _multiply(a, b):
+    if isinstance(a, int) and isinstance(b, int):
+        _check_bits(a.bit_length() + b.bit_length())
+    return a * b
+
+
+BINARY = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: _multiply,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+
+UNARY = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+FUNCTIONS = {
+    "abs": np.abs,
+    "sqrt": np.sqrt,
+    "exp": np.exp,
+    "log": np.log,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "min": np.minimum,
+    "max": np.maximum,
+}
+
+ARITY = {"min": 2, "max": 2}    # every other function takes one argument
+
+CONSTANTS = {"pi": math.pi, "e": math.e}
+
+
+class Expression:
+    """A compiled expression; call it with variable bindings."""
+
+    def __init__(self, source):
+        self.source = source
+        self.variables = set()
+        try:
+            tree = ast.parse(source.strip(), mode="eval")
+            self._run = self._compile(tree.body)
+        except SyntaxError as exc:
+            raise ValueError(f"invalid expression {source!r}: {exc.msg}") from None
+        except (RecursionError, MemoryError):
+            # the parser and _compile recurse once per level of nesting
+            raise ValueError(f"expression is nested too deeply: {source[:40]!r}...") from None
+
+    def __call__(self, **bindings):
+        return self.evaluate(bindings)
+
+    def evaluate(self, bindings=None):
+        """Evaluate with a mapping of variable -> number or NumPy array."""
+        bindings = bindings or {}
+        missing = self.variables - bindings.keys()
+        if missing:
+            raise ValueError(f"missing variables: {', '.join(sorted(missing))}")
+        try:
+            return self._run(bindings)
+        except RecursionError:
+            raise ValueError(f"expression is nested too deeply: {self.source[:40]!r}...") from None
+
+    def __repr__(self):
+        return f"Expression({self.source!r})"
+
+    def _compile(self, node):
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            value = node.value
+            return lambda env: value
+
+        if isinstance(node, ast.Name):
+            name = node.id
+            if name in CONSTANTS:
+                value = CONSTANTS[name]
+                return lambda env: value
+            self.variables.add(name)
+            return lambda env: env[name]
+
+        if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY:
+            op, operand = UNARY[type(node.op)], self._compile(node.operand)
+            return self._fold(lambda env: op(operand(env)), node.operand)
+
+        if isinstance(node, ast.BinOp):
+            if isinstance(node.op, ast.Pow):
+                op = _power
+            elif type(node.op) in BINARY:
+                op = BINARY[type(node.op)]
+            else:
+                raise ValueError(f"operator {type(node.op).__name__} is not allowed")
+            left, right = self._compile(node.left), self._compile(node.right)
+            return self._fold(lambda env: op(left(env), right(env)), node.left, node.right)
+
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id in FUNCTIONS and not node.keywords):
+            name = node.func.id
+            if len(node.args) != ARITY.get(name, 1):
+                raise ValueError(f"{name}() takes {ARITY.get(name, 1)} argument(s), "
+                                 f"got {len(node.args)}")
+            func = FUNCTIONS[name]
+            args = [self._compile(arg) for arg in node.args]
+            return self._fold(lambda env: func(*(arg(env) for arg in args)), *node.args)
+
+        raise ValueError(f"{type(node).__name__} is not allowed in {self.source!r}")
+
+    @staticmethod
+    def _fold(run, *children):
+        """Pre-compute sub-expressions that contain no variables."""
+        for child in children:
+            for sub in ast.walk(child):
+                if isinstance(sub, ast.Name) and sub.id not in CONSTANTS:
+                    return run
+        value = run({})
+        return lambda env: value
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(source):
+    """Parse and compile `source` once; repeated sources hit the LRU cache."""
+    return Expression(source)
+
+
+def evaluate(source, **bindings):
+    """evaluate("a * b + 1", a=2, b=np.arange(5)) -> array([1, 3, 5, 7, 9])"""
+    return compile_expression(source).evaluate(bindings)
+
+
+def benchmark(rows=5_000_000, sample=200_000):
+    """One formula over `rows` rows, compiled + vectorized vs eval() per row."""
+    import time
+
+    rng = np.random.default_rng(0)
+    data = {"price": rng.uniform(1, 100, rows), "qty": rng.integers(1, 10, rows),
+            "tax": rng.uniform(0, 0.2, rows)}
+    formula = "price * qty * (1 + tax) - max(price - 50, 0) * 0.1"
+
+    start = time.perf_counter()
+    evaluate(formula, **data)
+    vectorized = time.perf_counter() - start
+
+    columns = {k: v[:sample].tolist() for k, v in data.items()}
+    code = formula.replace("max(", "__max(")
+    start = time.perf_counter()
+    for p, q, t in zip(columns["price"], columns["qty"], columns["tax"]):
+        eval(code, {"__builtins__": {}, "__max": max}, {"price": p, "qty": q, "tax": t})
+    per_row = (time.perf_counter() - start) / sample * rows
+
+    print(f"{rows:,} rows: compiled+vectorized {vectorized:.3f}s, "
+          f"eval() per row ~{per_row:.1f}s (extrapolated from {sample:,})")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1:
+        print(evaluate(" ".join(sys.argv[1:])))
+    else:
+        benchmark()
@@ -0,0 +1,158 @@
+# Fast exact factorials with the prime-swing algorithm
+#
+#   n! = ((n // 2)!)**2 * swing(n)
+#
+# swing(n) is built from prime powers (see primes.py) and every product is
+# done by binary splitting, so the big multiplications stay balanced.
+# Results of recent queries are kept as checkpoints: asking for n after m
+# (m < n, close by) only multiplies m! by the numbers m+1..n.
+
+import math
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+
+from primes import base_primes
+
+CACHE_SIZE = 32         # checkpoint factorials kept in the LRU memo
+SMALL = 20              # below this a plain loop is fastest
+
+_checkpoints = OrderedDict()
+
+
+def product(numbers, lo=0, hi=None):
+    """Multiply numbers[lo:hi] by binary splitting."""
+    if hi is None:
+        hi = len(numbers)
+    if hi - lo <= 8:
+        result = 1
+        for i in range(lo, hi):
+            result *= numbers[i]
+        return result
+    mid = (lo + hi) // 2
+    return product(numbers, lo, mid) * product(numbers, mid, hi)
+
+
+def range_product(lo, hi):
+    """Return lo * (lo + 1) * ... * hi (1 if the range is empty)."""
+    if hi - lo <= 8:
+        result = 1
+        for i in range(lo, hi + 1):
+            result *= i
+        return result
+    mid = (lo + hi) // 2
+    return range_product(lo, mid) * range_product(mid + 1, hi)
+
+
+def swing(n, primes=None):
+    """Return n! // ((n // 2)!)**2 as a product of prime powers."""
+    if primes is None:
+        primes = base_primes(n).tolist()
+    factors = []
+    for p in primes:
+        if p > n:
+            break
+        q, e = n, 0
+        while q:
+            q //= p
+            e += q & 1
+        if e:
+            factors.append(p ** e if e > 1 else p)
+    return product(factors)
+
+
+def _prime_swing(n, primes):
+    if n < SMALL:
+        return range_product(2, n)
+    half = _prime_swing(n // 2, primes)
+    return half * half * swing(n, primes)
+
+
+def _remember(n, value):
+    _checkpoints[n] = value
+    _checkpoints.move_to_end(n)
+    if len(_checkpoints) > CACHE_SIZE:
+        _checkpoints.popitem(last=False)
+
+
+def factorial(n):
+    """Return n! exactly."""
+    if n < 0:
+        raise ValueError("factorial() not defined for negative values")
+    if n < SMALL:
+        return range_product(2, n)
+    if n in _checkpoints:
+        _checkpoints.move_to_end(n)
+        return _checkpoints[n]
+
+    # Start from the closest smaller checkpoint if it saves real work
+    keys = sorted(_checkpoints)
+    i = bisect_right(keys, n)
+    if i and n - keys[i - 1] <= n // 8:
+        m = keys[i - 1]
+        value = _checkpoints[m] * range_product(m + 1, n)
+    else:
+        value = _prime_swing(n, base_primes(n).tolist())
+    _remember(n, value)
+    return value
+
+
+def clear_cache():
+    _checkpoints.clear()
+
+
+# -------------------------------------------------------
+# Benchmark against math.factorial and the chapter scripts
+# -------------------------------------------------------
+
+def _loop_factorial(n):
+    # Harry_Python/Chapter_7/pc_06.py
+    fact = 1
+    for i in range(1, n + 1):
+        fact *= i
+    return fact
+
+
+def _recursive_factorial(n):
+    # Harry_Python/Chapter_8/recursion.py
+    if n == 1 or n == 0:
+        return 1
+    return n * _recursive_factorial(n - 1)
+
+
+def _timed(func, n):
+    t0 = time.perf_counter()
+    func(n)
+    return time.perf_counter() - t0
+
+
+def benchmark(sizes=(500, 10**4, 10**5, 10**6)):
+    print(f"{'n':>9} {'math':>10} {'swing':>10} {'loop':>10} {'recursive':>10}")
+    for n in sizes:
+        clear_cache()
+        t_math = _timed(math.factorial, n)
+        t_swing = _timed(factorial, n)
+        t_loop = _timed(_loop_factorial, n) if n <= 10**5 else None
+        t_rec = _timed(_recursive_factorial, n) if n < 900 else None
+        cells = [f"{t:>9.4f}s" if t is not None else f"{'-':>10}"
+                 for t in (t_math, t_swing, t_loop, t_rec)]
+        print(f"{n:>9} " + " ".join(cells))
+
+    # A run of nearby queries reuses the checkpoints
+    clear_cache()
+    queries = range(100_000, 100_400, 50)
+    t0 = time.perf_counter()
+    for n in queries:
+        factorial(n)
+    t_cached = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for n in queries:
+        math.factorial(n)
+    t_math = time.perf_counter() - t0
+    print(f"\n{len(queries)} queries near 10**5: "
+          f"swing+checkpoints {t_cached:.4f}s, math.factorial {t_math:.4f}s")
+    print("('-' = too slow or hits RecursionError)")
+
+
+if __name__ == "__main__":
+    benchmark()
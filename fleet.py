@@ -0,0 +1,138 @@
+# Struct-of-arrays fleet of cars
+#
+# car_speed.Car keeps one brand and one speed per object. Fleet keeps the
+# speeds of every car in one NumPy array and the brands as small integer
+# ids into a shared brand table, so accelerate/brake for a million cars is
+# a single masked array update. CarView gives the old one-car API on top.
+
+import numpy as np
+
+STEP = 10       # km/h per accelerate() / brake(), as in car_speed.Car
+
+
+class Fleet:
+    def __init__(self, brands=()):
+        self.brand_names = []
+        self.brand_index = {}
+        self.brand_ids = np.zeros(0, dtype=np.uint16)
+        self.speeds = np.zeros(0, dtype=np.int32)
+        if len(brands):
+            self.add(brands)
+
+    def __len__(self):
+        return len(self.speeds)
+
+    def _brand_id(self, name):
+        if name not in self.brand_index:
+            self.brand_index[name] = len(self.brand_names)
+            self.brand_names.append(name)
+        return self.brand_index[name]
+
+    def add(self, brands):
+        """Add one car per brand name; returns the range of new car indices."""
+        ids = np.fromiter((self._brand_id(b) for b in brands), dtype=np.uint16)
+        start = len(self.speeds)
+        self.brand_ids = np.concatenate((self.brand_ids, ids))
+        self.speeds = np.concatenate((self.speeds, np.zeros(len(ids), dtype=np.int32)))
+        return range(start, len(self.speeds))
+
+    def select(self, brand):
+        """Boolean mask of the cars of one brand."""
+        if brand not in self.brand_index:
+            return np.zeros(len(self), dtype=bool)
+        return self.brand_ids == self.brand_index[brand]
+
+    def accelerate(self, where=None):
+        """Speed up the selected cars by STEP.
+
+        where is a boolean mask or an array of distinct indices (None = all).
+        """
+        if where is None:
+            self.speeds += STEP
+        else:
+            self.speeds[where] += STEP
+
+    def brake(self, where=None):
+        """Slow the selected cars by STEP; cars below STEP keep their speed."""
+        if where is None:
+            np.subtract(self.speeds, STEP, out=self.speeds, where=self.speeds >= STEP)
+        else:
+            speeds = self.speeds[where]
+            speeds[speeds >= STEP] -= STEP
+            self.speeds[where] = speeds
+
+    def apply(self, commands):
+        """Run many (where, "accelerate" | "brake") commands in order."""
+        for where, command in commands:
+            getattr(self, command)(where)
+
+    def car(self, index):
+        return CarView(self, index)
+
+
+class CarView:
+    """One car of a Fleet with the same methods as car_speed.Car."""
+
+    __slots__ = ("fleet", "index")
+
+    def __init__(self, fleet, index):
+        self.fleet = fleet
+        self.index = index
+
+    @property
+    def brand(self):
+        return self.fleet.brand_names[self.fleet.brand_ids[self.index]]
+
+    @property
+    def speed(self):
+        return int(self.fleet.speeds[self.index])
+
+    def accelerate(self):
+        self.fleet.speeds[self.index] += STEP
+        print("Speed increased to:", self.speed)
+
+    def brake(self):
+        if self.speed >= STEP:
+            self.fleet.speeds[self.index] -= STEP
+        print("Speed decreased to:", self.speed)
+
+    def show(self):
+        print("Car:", self.brand, "| Speed:", self.speed)
+
+
+def benchmark(cars=1_000_000, rounds=10):
+    import contextlib
+    import io
+    import time
+
+    from car_speed import Car
+
+    brands = ["Toyota", "Honda", "Ford", "BMW", "Tesla"]
+    names = [brands[i % len(brands)] for i in range(cars)]
+    rng = np.random.default_rng(0)
+    plan = [rng.random(cars) < 0.5 for _ in range(rounds)]
+
+    objects = [Car(name) for name in names]
+    with contextlib.redirect_stdout(io.StringIO()) as sink:
+        start = time.perf_counter()
+        for r, mask in enumerate(plan):
+            for car, hit in zip(objects, mask.tolist()):
+                if hit:
+                    car.accelerate() if r % 3 else car.brake()
+            sink.seek(0)
+            sink.truncate()
+        t_objects = time.perf_counter() - start
+
+    fleet = Fleet(names)
+    start = time.perf_counter()
+    for r, mask in enumerate(plan):
+        fleet.accelerate(mask) if r % 3 else fleet.brake(mask)
+    t_fleet = time.perf_counter() - start
+
+    same = fleet.speeds.tolist() == [car.speed for car in objects]
+    print(f"{cars:,} cars x {rounds} commands: list of Car {t_objects:.2f}s, "
+          f"Fleet {t_fleet:.3f}s ({t_objects / t_fleet:,.0f}x), same speeds: {same}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,126 @@
+# Fixed-timestep frame scheduler for terminal (and vpython) animations
+#
+# Simulation ticks run at a fixed rate on a monotonic clock, independently
+# of how long drawing takes. When the loop falls behind it catches up on
+# ticks first and skips renders; if it falls too far behind it drops the
+# backlog instead of spiralling. Deadlines advance by whole periods, so
+# sleep jitter does not accumulate as drift.
+
+import atexit
+import sys
+import time
+from collections import deque
+
+
+class FrameStats:
+    """Live counters and recent timings (seconds) of a running scheduler."""
+
+    def __init__(self, window=4096):
+        self.ticks = 0
+        self.frames = 0
+        self.skipped_frames = 0
+        self.dropped_ticks = 0
+        self.tick_times = deque(maxlen=window)     # time spent in update()
+        self.render_times = deque(maxlen=window)   # time spent in render()
+        self.frame_times = deque(maxlen=window)    # interval between frames
+        self.started = time.monotonic()
+
+    def percentiles(self, samples, qs=(50, 95, 99)):
+        ordered = sorted(samples)
+        if not ordered:
+            return {q: 0.0 for q in qs}
+        return {q: ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+                for q in qs}
+
+    def fps(self):
+        elapsed = time.monotonic() - self.started
+        return self.frames / elapsed if elapsed > 0 else 0.0
+
+    def summary(self):
+        lines = [f"ticks {self.ticks} (dropped {self.dropped_ticks}), "
+                 f"frames {self.frames} (skipped {self.skipped_frames}), "
+                 f"{self.fps():.1f} fps"]
+        for name, samples in (("tick", self.tick_times),
+                              ("render", self.render_times),
+                              ("frame", self.frame_times)):
+            if samples:
+                p = self.percentiles(samples)
+                lines.append(f"{name:>6} ms  p50 {p[50] * 1e3:8.3f}  "
+                             f"p95 {p[95] * 1e3:8.3f}  p99 {p[99] * 1e3:8.3f}")
+        return "\n".join(lines)
+
+    def dump(self, file=None):
+        print(self.summary(), file=file or sys.stderr)
+
+    def dump_at_exit(self, file=None):
+        atexit.register(self.dump, file)
+
+
+class FrameScheduler:
+    """Call update() tick_rate times a second and render() up to frame_rate.
+
+    tick_rate=None runs ticks back to back, one per loop (and one render
+    per tick if render is given), for headless benchmarks.
+    sleep can be swapped for a toolkit's own sleep (e.g. vpython.sleep).
+    """
+
+    def __init__(self, tick_rate, frame_rate=None, max_catchup=5,
+                 sleep=time.sleep, clock=time.monotonic):
+        self.tick_dt = 1 / tick_rate if tick_rate else 0.0
+        frame_rate = frame_rate or tick_rate
+        self.frame_dt = 1 / frame_rate if frame_rate else 0.0
+        self.max_catchup = max_catchup
+        self.sleep = sleep
+        self.clock = clock
+        self.stats = FrameStats()
+        self.running = False
+
+    def stop(self):
+        self.running = False
+
+    def run(self, update, render=None, ticks=None):
+        """Run until stop() is called or `ticks` ticks have been simulated."""
+        stats, clock = self.stats, self.clock
+        self.running = True
+        next_tick = next_frame = last_frame = clock()
+        while self.running and (ticks is None or stats.ticks < ticks):
+            now = clock()
+            done = 0
+            limit = self.max_catchup if self.tick_dt else 1
+            while now >= next_tick and done < limit:
+                start = clock()
+                update()
+                now = clock()
+                stats.tick_times.append(now - start)
+                stats.ticks += 1
+                done += 1
+                next_tick += self.tick_dt
+                if ticks is not None and stats.ticks >= ticks:
+                    break
+            if now >= next_tick and done == self.max_catchup and self.tick_dt:
+                # Too far behind: give up on the backlog instead of drifting
+                missed = int((now - next_tick) / self.tick_dt) + 1
+                stats.dropped_ticks += missed
+                next_tick += missed * self.tick_dt
+
+            if render is not None and now >= next_frame:
+                if now >= next_tick and self.tick_dt:
+                    stats.skipped_frames += 1
+                else:
+                    render()
+                    end = clock()
+                    stats.render_times.append(end - now)
+                    stats.frame_times.append(end - last_frame)
+                    stats.frames += 1
+                    last_frame = end
+                next_frame += self.frame_dt
+                if next_frame < now:
+                    next_frame = now + self.frame_dt
+
+            if self.tick_dt:
+                wake = min(next_tick, next_frame) if render else next_tick
+                pause = wake - clock()
+                if pause > 0:
+                    self.sleep(pause)
+        self.running = False
+        return stats
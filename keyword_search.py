@@ -0,0 +1,218 @@
+# Keyword search with line and column numbers over many files
+#
+# Chapter_9/Practice_set/pc_07.py and pc_08.py look for "Donkey" one line
+# at a time with Python loops. search() takes a word list and any number
+# of files or glob patterns, hands the files to a process pool, and
+# reports every occurrence as (file, line, column, word), in file order
+# and then position order:
+#
+#   python keyword_search.py Donkey Monkey -- "logs/**/*.txt" file.txt
+#   python keyword_search.py -w words.txt -i -p 4 -- "*.log"
+#
+# Each file is read in large binary blocks and searched with bytes.find,
+# which runs in C; Python only touches the hits. The last maxlen - 1
+# bytes of a block are carried into the next one, so a word split across
+# a block boundary is still found. Lines and columns are 1-based and
+# columns count bytes.
+
+import glob
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+BLOCK_SIZE = 8 << 20
+
+
+def _encode(words, ignore_case):
+    encoded = []
+    for word in words:
+        word = word.encode() if isinstance(word, str) else word
+        encoded.append(word.lower() if ignore_case else word)
+    return encoded
+
+
+def search_file(path, words, ignore_case=False, block_size=BLOCK_SIZE):
+    """Every occurrence of every word in the file as (line, column, word).
+
+    Occurrences of different words may overlap, and so may repeats of
+    one word ("aa" is found twice in "aaa"). Sorted by position.
+    """
+    needles = [(w, k) for k, w in enumerate(_encode(words, ignore_case)) if w]
+    keep = max((len(w) for w, _ in needles), default=1) - 1
+    hits = []
+    line, line_start = 1, 0     # line number and its start offset at buf[cursor]
+    base = 0                    # file offset of buf[0]
+    buf = b""
+    cursor = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(block_size)
+            seen = len(buf)     # buf[:seen] was already searched
+            buf += chunk.lower() if ignore_case else chunk
+            found = []
+            for word, k in needles:
+                pos = buf.find(word, max(seen - len(word) + 1, 0))
+                while pos >= 0:
+                    found.append((pos, k))
+                    pos = buf.find(word, pos + 1)
+            found.sort()
+            for pos, k in found:
+                # pos < cursor only for a word straddling the last block, whose
+                # start is on the cursor's line (words hold no newlines)
+                newlines = buf.count(b"\n", cursor, pos)
+                if newlines:
+                    line += newlines
+                    line_start = base + buf.rfind(b"\n", cursor, pos) + 1
+                cursor = max(cursor, pos)
+                hits.append((line, base + pos - line_start + 1, k))
+            if not chunk:
+                # a longer word straddling a block is found after shorter ones at its start
+                hits.sort()
+                return [(line, column, words[k]) for line, column, k in hits]
+            cut = max(len(buf) - keep, 0)
+            if cut > cursor:
+                newlines = buf.count(b"\n", cursor, cut)
+                if newlines:
+                    line += newlines
+                    line_start = base + buf.rfind(b"\n", cursor, cut) + 1
+                cursor = cut
+            buf = buf[cut:]
+            base += cut
+            cursor -= cut
+
+
+def expand_paths(patterns):
+    """Files for a mix of paths and glob patterns ("**" recurses), without repeats."""
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if path not in seen and not os.path.isdir(path):
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+
+def _search_job(path, words, ignore_case, block_size):
+    return search_file(path, words, ignore_case, block_size)
+
+
+def search(patterns, words, ignore_case=False, processes=1, block_size=BLOCK_SIZE):
+    """Yield (file, line, column, word) for every occurrence, in order.
+
+    processes=1 searches in the calling process; otherwise files go to a
+    pool with at most two per worker in flight.
+    """
+    paths = expand_paths(patterns)
+    if processes == 1:
+        for path in paths:
+            for hit in search_file(path, words, ignore_case, block_size):
+                yield (path, *hit)
+        return
+    workers = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+
+        def finish():
+            path, future = pending.popleft()
+            return ((path, *hit) for hit in future.result())
+
+        for path in paths:
+            pending.append((path, pool.submit(_search_job, path, words, ignore_case, block_size)))
+            if len(pending) >= 2 * workers:
+                yield from finish()
+        while pending:
+            yield from finish()
+
+
+def search_lines(path, words):
+    """The per-line loop from pc_08.py, kept as the benchmark baseline."""
+    hits = []
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for lineno, line in enumerate(f, 1):
+            for k, word in enumerate(words):
+                pos = line.find(word)
+                while pos >= 0:
+                    hits.append((lineno, pos + 1, k))
+                    pos = line.find(word, pos + 1)
+    return [(lineno, column, words[k]) for lineno, column, k in sorted(hits)]
+
+
+def benchmark(files=8, megabytes=50, words=("Donkey", "Monkey", "Turkey"), seed=0):
+    import random
+    import tempfile
+
+    rng = random.Random(seed)
+    vocabulary = [b"the", b"quick", b"brown", b"fox", b"jumps", b"over", b"lazy", b"dog",
+                  b"farm", b"field", b"barn", b"hay"]
+    with tempfile.TemporaryDirectory() as tmp:
+        lines = []
+        for _ in range(50_000):
+            row = rng.choices(vocabulary, k=rng.randint(3, 15))
+            if rng.random() < 0.002:
+                row.insert(rng.randrange(len(row)), rng.choice(words).encode())
+            lines.append(b" ".join(row))
+        block = b"\n".join(lines) + b"\n"
+        for i in range(files):
+            with open(os.path.join(tmp, f"log{i}.txt"), "wb") as f:
+                for _ in range(megabytes * 1_000_000 // len(block)):
+                    f.write(block)
+        pattern = os.path.join(tmp, "*.txt")
+        paths = expand_paths([pattern])
+        gb = sum(os.path.getsize(p) for p in paths) / 1e9
+
+        start = time.perf_counter()
+        expected = [(p, *hit) for p in paths for hit in search_lines(p, words)]
+        t = time.perf_counter() - start
+        print(f"{len(paths)} files, {gb:.2f} GB, {len(expected):,} hits")
+        print(f"  per-line loop:        {gb / t:.3f} GB/s")
+        for workers in (1, None):
+            start = time.perf_counter()
+            found = list(search([pattern], words, processes=workers))
+            t = time.perf_counter() - start
+            assert found == expected
+            print(f"  block find, processes={workers or os.cpu_count()}: {gb / t:.3f} GB/s")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Find words in files, with line and column",
+        usage="%(prog)s [options] WORD [WORD ...] -- FILE [FILE ...]\n"
+              "       %(prog)s [options] WORD FILE [FILE ...]\n"
+              "       %(prog)s [options] -w WORDS.txt FILE [FILE ...]")
+    parser.add_argument("args", nargs="*", help='words, then files or glob patterns')
+    parser.add_argument("-w", "--word-file", help="file with one word per line")
+    parser.add_argument("-i", "--ignore-case", action="store_true")
+    parser.add_argument("-p", "--processes", type=int, default=1, help="0 = one per CPU")
+    parser.add_argument("--bench", action="store_true")
+    argv = sys.argv[1:]
+    split = argv.index("--") if "--" in argv else None
+    args = parser.parse_args(argv if split is None else argv[:split])
+    if split is not None:
+        words, files = args.args, argv[split + 1:]
+    elif args.word_file:
+        words, files = [], args.args
+    else:
+        words, files = args.args[:1], args.args[1:]
+
+    if args.bench:
+        benchmark()
+        sys.exit()
+    if args.word_file:
+        with open(args.word_file, encoding="utf-8") as f:
+            words += [line.strip() for line in f if line.strip()]
+    if not words or not files:
+        parser.error("give at least one word and one file")
+    out = sys.stdout
+    count = 0
+    for path, line, column, word in search(files, words, args.ignore_case,
+                                           args.processes or None):
+        out.write(f"{path}:{line}:{column}: {word}\n")
+        count += 1
+    if not count:
+        sys.exit(1)
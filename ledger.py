@@ -0,0 +1,267 @@
+# Append-only transaction journal and batch engine for bank accounts
+#
+# Every accepted deposit/withdrawal becomes one fixed-size binary record in
+# a journal file. Writes are grouped: records collect in memory and are
+# written + fsync'ed together once `fsync_interval` seconds have passed
+# (group commit); whatever is still queued is committed by close() or at
+# interpreter exit. Balances live in one int64 NumPy array indexed by
+# account id, so a whole batch of transactions is validated and applied
+# with array operations, and after a restart the balances are rebuilt
+# straight from the memory-mapped journal.
+
+import atexit
+import os
+import time
+
+import numpy as np
+
+MAGIC = b"LEDGER01"
+HEADER = 16                     # magic + record size + padding
+
+DEPOSIT = 0
+WITHDRAW = 1
+VECTOR_PASSES = 8               # then validate_batch finishes account by account
+
+RECORD = np.dtype([
+    ("seq", "<u8"),
+    ("time", "<f8"),
+    ("account", "<u4"),
+    ("kind", "u1"),
+    ("_pad", "u1", (3,)),
+    ("amount", "<i8"),          # always positive; kind gives the sign
+])
+
+
+class Journal:
+    """Append-only file of RECORD entries with group commit."""
+
+    def __init__(self, path, fsync_interval=0.05):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size < HEADER:
+            # new file, or a crash before the header was complete
+            with open(path, "wb") as f:
+                f.write(MAGIC + np.uint32(RECORD.itemsize).tobytes() + bytes(4))
+                f.flush()
+                os.fsync(f.fileno())
+        count = len(read_journal(path))
+        if os.path.getsize(path) != HEADER + count * RECORD.itemsize:
+            # drop a torn last record, or every later append is misaligned
+            os.truncate(path, HEADER + count * RECORD.itemsize)
+        self.file = open(path, "ab")
+        self.seq = count
+        self.pending = []
+        self.last_sync = time.monotonic()
+        atexit.register(self.close)
+
+    def append(self, records):
+        """Queue a RECORD array; it is durable after the next commit()."""
+        n = len(records)
+        records["seq"] = np.arange(self.seq, self.seq + n)
+        self.seq += n
+        self.pending.append(records.tobytes())
+        if time.monotonic() - self.last_sync >= self.fsync_interval:
+            self.commit()
+
+    def commit(self):
+        if self.pending:
+            self.file.write(b"".join(self.pending))
+            self.pending.clear()
+            self._sync()
+
+    def _sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.last_sync = time.monotonic()
+
+    def close(self):
+        if not self.file.closed:
+            self.commit()
+            self.file.close()
+            atexit.unregister(self.close)
+
+
+def read_journal(path):
+    """Memory-map the journal's records (a torn last record is ignored)."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = f.read(HEADER)
+    if head[:8] != MAGIC or int(np.frombuffer(head[8:12], "<u4")[0]) != RECORD.itemsize:
+        raise ValueError(f"{path} is not a ledger journal")
+    count = (size - HEADER) // RECORD.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=RECORD)
+    return np.memmap(path, dtype=RECORD, mode="r", offset=HEADER, shape=(count,))
+
+
+def rebuild_balances(path, accounts=0):
+    """Replay the journal into a balance array (journaled ops were all valid)."""
+    records = read_journal(path)
+    size = max(accounts, int(records["account"].max()) + 1 if len(records) else 0)
+    balances = np.zeros(size, dtype=np.int64)
+    signed = np.where(records["kind"] == DEPOSIT, records["amount"], -records["amount"])
+    np.add.at(balances, records["account"], signed)
+    return balances
+
+
+def validate_batch(balances, accounts, amounts):
+    """Which of the signed amounts would be accepted, applied in order.
+
+    A withdrawal (negative amount) is rejected when it would overdraw the
+    account at that point of the batch, exactly as one-by-one processing
+    would do. Each pass rejects the first overdraft of every account and
+    recomputes the running balances of the accounts that changed. Accounts
+    still being rejected after VECTOR_PASSES passes are finished with one
+    sequential scan of their rows, so an account with thousands of
+    overdraft attempts costs linear, not quadratic, time.
+    """
+    accepted = amounts != 0
+    if not len(amounts):
+        return accepted
+    order = np.argsort(accounts, kind="stable")
+    acc = accounts[order]
+    amt = amounts[order]
+    ok = accepted[order]
+    rows = np.arange(len(acc))          # rows still being checked
+    passes = 0
+    while len(rows):
+        if passes == VECTOR_PASSES:
+            _validate_rows(balances, acc, amt, ok, rows)
+            break
+        passes += 1
+        a = acc[rows]
+        new_group = np.r_[True, a[1:] != a[:-1]]
+        starts = np.flatnonzero(new_group)
+        group = np.cumsum(new_group) - 1
+        total = np.cumsum(np.where(ok[rows], amt[rows], 0))
+        running = balances[a] + total - np.r_[0, total][starts][group]
+        bad = np.flatnonzero((running < 0) & ok[rows])
+        if not len(bad):
+            break
+        first = bad[np.r_[True, group[bad][1:] != group[bad][:-1]]]
+        ok[rows[first]] = False
+        # Only accounts that just had a rejection can change on the next pass
+        rows = rows[np.isin(group, group[first])]
+    accepted[order] = ok
+    return accepted
+
+
+def _validate_rows(balances, acc, amt, ok, rows):
+    """One in-order pass over whole accounts' rows (sorted by account), in place."""
+    current, running = None, 0
+    for r, a, v in zip(rows.tolist(), acc[rows].tolist(), amt[rows].tolist()):
+        if a != current:
+            current, running = a, int(balances[a])
+        if not ok[r]:
+            continue
+        if running + v < 0:
+            ok[r] = False
+        else:
+            running += v
+
+
+def _check_amount(amount):
+    if amount <= 0:
+        raise ValueError(f"amount must be positive, got {amount}")
+
+
+class Ledger:
+    """Account balances backed by a journal; ids are small integers.
+
+    Only ids are journaled, not names: after a restart open_account() must
+    be called in the same order to get the same ids back.
+    """
+
+    def __init__(self, path, fsync_interval=0.05):
+        self.journal = Journal(path, fsync_interval)
+        self.balances = rebuild_balances(path)
+        self.replayed = len(self.balances)     # ids that already have history
+        self.names = {}
+
+    def open_account(self, name, balance=0):
+        """Id for name; the opening balance is only deposited for a new account."""
+        if name not in self.names:
+            self.names[name] = len(self.names)
+            self._grow(len(self.names))
+        account = self.names[name]
+        if balance and account >= self.replayed:
+            self.apply_batch([account], [balance])
+            self.replayed = account + 1
+        return account
+
+    def _grow(self, size):
+        if size > len(self.balances):
+            grown = np.zeros(max(size, 2 * len(self.balances)), dtype=np.int64)
+            grown[:len(self.balances)] = self.balances
+            self.balances = grown
+
+    def balance(self, account):
+        return int(self.balances[account])
+
+    def deposit(self, account, amount):
+        """True if accepted; amount must be positive."""
+        _check_amount(amount)
+        return bool(self.apply_batch([account], [amount])[0])
+
+    def withdraw(self, account, amount):
+        """True if accepted, False if it would overdraw; amount must be positive."""
+        _check_amount(amount)
+        return bool(self.apply_batch([account], [-amount])[0])
+
+    def apply_batch(self, accounts, amounts):
+        """Apply signed amounts (+deposit / -withdrawal) in order.
+
+        Returns a boolean array telling which transactions were accepted;
+        only accepted ones are journaled.
+        """
+        accounts = np.asarray(accounts, dtype=np.uint32)
+        amounts = np.asarray(amounts, dtype=np.int64)
+        if len(accounts):
+            self._grow(int(accounts.max()) + 1)
+        accepted = validate_batch(self.balances, accounts, amounts)
+        acc, amt = accounts[accepted], amounts[accepted]
+        np.add.at(self.balances, acc, amt)
+
+        records = np.zeros(len(acc), dtype=RECORD)
+        records["time"] = time.time()
+        records["account"] = acc
+        records["kind"] = np.where(amt > 0, DEPOSIT, WITHDRAW)
+        records["amount"] = np.abs(amt)
+        self.journal.append(records)
+        return accepted
+
+    def commit(self):
+        self.journal.commit()
+
+    def close(self):
+        self.journal.close()
+
+
+def benchmark(path, accounts=100_000, transactions=5_000_000):
+    rng = np.random.default_rng(0)
+    ledger = Ledger(path)
+    ledger.apply_batch(np.arange(accounts), np.full(accounts, 1_000))
+    ids = rng.integers(0, accounts, transactions)
+    amounts = rng.integers(1, 200, transactions) * rng.choice([-1, 1], transactions)
+
+    start = time.perf_counter()
+    accepted = ledger.apply_batch(ids, amounts)
+    ledger.commit()
+    elapsed = time.perf_counter() - start
+    print(f"apply_batch: {transactions:,} transactions in {elapsed:.2f}s "
+          f"({transactions / elapsed:,.0f}/sec, {(~accepted).sum():,} rejected)")
+
+    start = time.perf_counter()
+    rebuilt = rebuild_balances(path, accounts)
+    elapsed = time.perf_counter() - start
+    print(f"rebuild: {len(read_journal(path)):,} records in {elapsed:.2f}s, "
+          f"matches: {np.array_equal(rebuilt, ledger.balances[:accounts])}")
+    ledger.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        benchmark(os.path.join(tmp, "bench.ledger"))
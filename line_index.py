@@ -0,0 +1,286 @@
+# Line-offset index for random access into large text files
+#
+# Chapter_9/file-while_function.py walks a file with readline() and
+# pc_08.py counts lines by hand to report where a word is. For logs with
+# 100M lines, LineIndex records where every line starts: one uint64 per
+# line, found with a vectorized newline scan over an mmap of the file.
+# The offsets are cached next to the file (<file>.lidx) together with the
+# file's size and mtime, and rebuilt when either changes. With the index,
+#
+#   index[n]          line n (0-based) is one slice of the mmap,
+#   index[a:b]        a list of lines, index.block(a, b) the raw bytes,
+#   index.grep(pat)   (line number, line) for every matching line, with
+#                     the file split into line-aligned segments that are
+#                     searched in worker processes.
+#
+#   python line_index.py big.log 1000000            print line 1,000,000
+#   python line_index.py big.log 10:20              lines 10-19
+#   python line_index.py big.log --grep Donkey -p 4
+
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from mmap_regex import MappedFile, compile_pattern
+
+MAGIC = b"LINEIDX1"
+HEADER_FIELDS = ("size", "mtime_ns", "lines")
+HEADER_SIZE = len(MAGIC) + 8 * len(HEADER_FIELDS)
+BLOCK = 64 << 20
+SEGMENT = 32 << 20
+
+
+def scan_offsets(data, block=BLOCK):
+    """Start offset of every line in data, plus len(data) at the end (uint64)."""
+    size = len(data)
+    parts = [np.zeros(1, dtype=np.uint64)]
+    for start in range(0, size, block):
+        chunk = np.frombuffer(data, dtype=np.uint8, count=min(block, size - start), offset=start)
+        parts.append((np.flatnonzero(chunk == 10) + (start + 1)).astype(np.uint64))
+        del chunk               # release the buffer export before the mmap closes
+    offsets = np.concatenate(parts)
+    if offsets[-1] != size:     # last line without a trailing newline
+        offsets = np.append(offsets, np.uint64(size))
+    return offsets
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def save_offsets(path, offsets, stamp):
+    """Write a cache file atomically: MAGIC, size, mtime_ns, lines, offsets."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + np.array([*stamp, len(offsets) - 1], "<u8").tobytes())
+        np.ascontiguousarray(offsets, dtype="<u8").tofile(f)
+    os.replace(tmp, path)
+
+
+def load_offsets(path, stamp):
+    """Memory-mapped offsets from a cache file, or None if missing or stale."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(HEADER_SIZE)
+    except OSError:
+        return None
+    if len(head) < HEADER_SIZE or head[:len(MAGIC)] != MAGIC:
+        return None
+    size, mtime_ns, lines = np.frombuffer(head, "<u8", offset=len(MAGIC)).tolist()
+    if (size, mtime_ns) != tuple(stamp) or os.path.getsize(path) != HEADER_SIZE + 8 * (lines + 1):
+        return None
+    return np.memmap(path, dtype="<u8", mode="r", offset=HEADER_SIZE, shape=(lines + 1,))
+
+
+class LineIndex:
+    def __init__(self, path, cache=True):
+        """cache: True for <path>.lidx, a path of its own, or False for none."""
+        self.path = path
+        self.cache = f"{path}.lidx" if cache is True else cache or None
+        self._mapped = MappedFile(path)
+        self.data = self._mapped.data
+        stamp = _stamp(path)
+        offsets = load_offsets(self.cache, stamp) if self.cache else None
+        self.cached = offsets is not None
+        if offsets is None:
+            offsets = scan_offsets(self.data)
+            if self.cache:
+                try:
+                    save_offsets(self.cache, offsets, stamp)
+                except OSError:
+                    self.cache = None       # read-only directory: keep it in memory
+        self.offsets = offsets
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.offsets = None
+        self._mapped.__exit__()
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, n):
+        """Line n without its newline; a slice gives a list of lines."""
+        if isinstance(n, slice):
+            start, stop, step = n.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self.block(start, stop).split(b"\n")[:stop - start] if stop > start else []
+        if n < 0:
+            n += len(self)
+        if not 0 <= n < len(self):
+            raise IndexError("line number out of range")
+        start, stop = int(self.offsets[n]), int(self.offsets[n + 1])
+        line = self.data[start:stop]
+        return line[:-1] if line.endswith(b"\n") else line
+
+    def block(self, start, stop):
+        """Raw bytes of lines start..stop-1, newlines included."""
+        stop = min(stop, len(self))
+        if start >= stop:
+            return b""
+        return self.data[int(self.offsets[start]):int(self.offsets[stop])]
+
+    def line_number(self, offset):
+        """0-based number of the line containing byte offset."""
+        return int(np.searchsorted(self.offsets, offset, side="right")) - 1
+
+    def segments(self, size=SEGMENT):
+        """Line ranges (first, stop) of roughly `size` bytes each."""
+        cuts = np.searchsorted(self.offsets, np.arange(0, int(self.offsets[-1]), size), side="left")
+        cuts = np.unique(np.append(cuts, len(self)))
+        return list(zip(cuts[:-1].tolist(), cuts[1:].tolist()))
+
+    def grep(self, pattern, flags=0, processes=1, segment=SEGMENT):
+        """Yield (line number, line) for every line matching pattern, in order.
+
+        pattern is a regex (str or bytes) matched line by line, like grep:
+        ^ and $ match at every line start and end (re.MULTILINE is always
+        on), and a match never spans a newline. Line numbers are 1-based
+        like grep -n, and the result does not depend on the segment size.
+        processes=1 searches in the calling process; otherwise segments go
+        to a pool with at most two per worker in flight.
+        """
+        jobs = [(first, int(self.offsets[first]), int(self.offsets[stop]))
+                for first, stop in self.segments(segment)]
+        if processes == 1:
+            for first, start, stop in jobs:
+                yield from _grep_block(self.data, pattern, flags, first, start, stop)
+            return
+        workers = processes or os.cpu_count() or 1
+        with ProcessPoolExecutor(workers) as pool:
+            pending = deque()
+            for job in jobs:
+                pending.append(pool.submit(_grep_segment, self.path, pattern, flags, *job))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+
+def _grep_block(data, pattern, flags, first, start, stop):
+    """(line number, line) matches in data[start:stop], which starts at line `first`."""
+    regex = compile_pattern(pattern, flags | re.MULTILINE)
+    hits = []
+    lineno, counted = first + 1, start
+    pos = start
+    while pos <= stop:
+        m = regex.search(data, pos, stop)
+        if m is None or m.start() == stop and data[stop - 1:stop] == b"\n":
+            break               # nothing, or an empty match after the last newline
+        begin = data.rfind(b"\n", start, m.start()) + 1 or start
+        end = data.find(b"\n", m.start(), stop)
+        end = stop if end < 0 else end
+        if m.end() > end and regex.search(data, begin, end) is None:
+            pos = end + 1       # the match ran over the newline and the line alone fails
+            continue
+        lineno += data[counted:begin].count(b"\n")     # mmap has no count()
+        counted = begin
+        hits.append((lineno, data[begin:end]))
+        pos = end + 1
+    return hits
+
+
+def _grep_segment(path, pattern, flags, first, start, stop):
+    with MappedFile(path) as data:
+        return _grep_block(data, pattern, flags, first, start, stop)
+
+
+def benchmark(lines=5_000_000, word="Donkey", processes=(1, None)):
+    import random
+    import tempfile
+
+    rng = random.Random(0)
+    words = [b"the", b"quick", b"brown", b"fox", b"jumps", b"over", b"lazy", b"dog", b"log"]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "big.log")
+        with open(path, "wb") as f:
+            for start in range(0, lines, 100_000):
+                rows = [b" ".join(rng.choices(words, k=rng.randint(3, 15)))
+                        for _ in range(min(100_000, lines - start))]
+                for i in rng.sample(range(len(rows)), len(rows) // 1000):
+                    rows[i] += b" " + word.encode()
+                f.write(b"\n".join(rows) + b"\n")
+        mb = os.path.getsize(path) / 1e6
+
+        start = time.perf_counter()
+        with open(path, "rb") as f:
+            count = sum(1 for _ in f)
+        print(f"{count:,} lines, {mb:,.0f} MB; counting with a for loop: "
+              f"{time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        index = LineIndex(path)
+        print(f"index built and cached in {time.perf_counter() - start:.2f}s")
+        index.close()
+        start = time.perf_counter()
+        index = LineIndex(path)
+        print(f"index loaded from cache in {(time.perf_counter() - start) * 1e3:.2f} ms")
+        assert index.cached and len(index) == count
+
+        picks = [rng.randrange(count) for _ in range(100_000)]
+        start = time.perf_counter()
+        for n in picks:
+            index[n]
+        print(f"random line fetch: {(time.perf_counter() - start) / len(picks) * 1e6:.2f} us/line")
+
+        start = time.perf_counter()
+        with open(path, "rb") as f:
+            expected = [(n, line.rstrip(b"\n")) for n, line in enumerate(f, 1)
+                        if word.encode() in line]
+        t = time.perf_counter() - start
+        print(f"per-line loop grep: {mb / t:,.0f} MB/s ({len(expected):,} lines)")
+        for workers in processes:
+            start = time.perf_counter()
+            found = list(index.grep(word, processes=workers))
+            t = time.perf_counter() - start
+            assert found == expected
+            print(f"index.grep processes={workers or os.cpu_count()}: {mb / t:,.0f} MB/s")
+        index.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Random access and grep -n for big text files")
+    parser.add_argument("path", nargs="?")
+    parser.add_argument("lines", nargs="*", help="line numbers (1-based) or ranges like 10:20")
+    parser.add_argument("--grep", metavar="PATTERN", help="print matching lines with numbers")
+    parser.add_argument("-i", "--ignore-case", action="store_true")
+    parser.add_argument("-p", "--processes", type=int, default=1, help="0 = one per CPU")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write <path>.lidx")
+    parser.add_argument("--bench", action="store_true")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark()
+    elif not args.path:
+        parser.error("give a file")
+    else:
+        out = sys.stdout.buffer
+        with LineIndex(args.path, cache=not args.no_cache) as index:
+            for spec in args.lines:
+                first, _, last = spec.partition(":")
+                if _:
+                    start = int(first or 1)
+                    for n, line in enumerate(index[start - 1:int(last or len(index) + 1) - 1], start):
+                        out.write(b"%d:%s\n" % (n, line))
+                else:
+                    out.write(index[int(first) - 1] + b"\n")
+            if args.grep:
+                flags = re.IGNORECASE if args.ignore_case else 0
+                for n, line in index.grep(args.grep, flags, args.processes or None):
+                    out.write(b"%d:%s\n" % (n, line))
+            if not args.lines and not args.grep:
+                print(f"{len(index):,} lines", file=sys.stderr)
@@ -11,8 +11,18 @@ def reverse_mash(word1, word2):
     return new_word
 
 # Example usage
-w1 = input("Enter first word: ")
-w2 = input("Enter second word: ")
+#   python mix-word.py                       -> asks for two words
+#   python mix-word.py pairs.txt             -> one "word1 word2" per line ("-" = stdin)
+#   python mix-word.py firsts.txt seconds.txt
+if __name__ == "__main__":
+    import sys
 
-result = reverse_mash(w1, w2)
-print("Your new word:", result)
\ No newline at end of file
+    if len(sys.argv) > 1:
+        from word_mash import run
+        run("reverse", sys.argv[1:3])
+    else:
+        w1 = input("Enter first word: ")
+        w2 = input("Enter second word: ")
+
+        result = reverse_mash(w1, w2)
+        print("Your new word:", result)
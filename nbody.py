@@ -0,0 +1,221 @@
+# Headless N-body gravity with a leapfrog (kick-drift-kick) integrator
+#
+# Positions, velocities and accelerations are (N, 3) NumPy arrays. Forces
+# are either summed directly (O(N^2), done in row blocks to bound memory)
+# or approximated with a Barnes-Hut octree (O(N log N)), which is what
+# makes 10k+ bodies practical. Trajectories can be streamed to a
+# memory-mapped .npy file, so long runs never have to fit in RAM.
+
+import time
+
+import numpy as np
+
+BLOCK_BYTES = 64 << 20          # scratch memory for one block of direct sums
+
+
+class Octree:
+    """Barnes-Hut octree stored as flat arrays (node 0 is the root)."""
+
+    def __init__(self, pos, mass, leaf_size=8, max_depth=32):
+        centers, halves, masses, coms, children = [], [], [], [], []
+        leaf_start, leaf_end = [], []
+        order = []
+
+        lo, hi = pos.min(axis=0), pos.max(axis=0)
+        half = max((hi - lo).max() / 2, 1e-12)
+        stack = [(np.arange(len(pos)), (lo + hi) / 2, half, 0, -1, 0)]
+        while stack:
+            idx, center, half, depth, parent, octant = stack.pop()
+            node = len(centers)
+            if parent >= 0:
+                children[parent][octant] = node
+            m = mass[idx]
+            total = m.sum()
+            centers.append(center)
+            halves.append(half)
+            masses.append(total)
+            coms.append(m @ pos[idx] / total if total > 0 else center)
+            children.append([-1] * 8)
+            if len(idx) <= leaf_size or depth >= max_depth:
+                leaf_start.append(len(order))
+                order.extend(idx.tolist())
+                leaf_end.append(len(order))
+                continue
+            leaf_start.append(-1)
+            leaf_end.append(-1)
+            upper = pos[idx] >= center
+            code = upper[:, 0] * 4 + upper[:, 1] * 2 + upper[:, 2]
+            for o in range(8):
+                sub = idx[code == o]
+                if len(sub):
+                    sign = np.array([(o >> 2) & 1, (o >> 1) & 1, o & 1]) * 2 - 1
+                    stack.append((sub, center + sign * half / 2, half / 2,
+                                  depth + 1, node, o))
+
+        self.center = np.array(centers)
+        self.size = 2 * np.array(halves)
+        self.mass = np.array(masses)
+        self.com = np.array(coms)
+        self.children = np.array(children, dtype=np.int64)
+        self.leaf_start = np.array(leaf_start, dtype=np.int64)
+        self.leaf_end = np.array(leaf_end, dtype=np.int64)
+        self.order = np.array(order, dtype=np.int64)
+        self.body_mass = mass
+
+    def accelerations(self, pos, G, softening, theta):
+        """Walk the tree for every body at once, one tree level per pass."""
+        n = len(pos)
+        acc = np.zeros((n, 3))
+        eps2 = softening ** 2
+        body = np.arange(n)
+        node = np.zeros(n, dtype=np.int64)
+
+        def add(b, delta, m):
+            r2 = np.einsum("ij,ij->i", delta, delta) + eps2
+            w = G * m / (r2 * np.sqrt(r2))
+            for k in range(3):
+                acc[:, k] += np.bincount(b, w * delta[:, k], minlength=n)
+
+        while len(body):
+            delta = self.com[node] - pos[body]
+            r2 = np.einsum("ij,ij->i", delta, delta)
+            far = self.size[node] ** 2 < theta * theta * r2
+            add(body[far], delta[far], self.mass[node[far]])
+
+            near = ~far
+            leaf = near & (self.leaf_start[node] >= 0)
+            if leaf.any():
+                b, nd = body[leaf], node[leaf]
+                counts = self.leaf_end[nd] - self.leaf_start[nd]
+                b = np.repeat(b, counts)
+                slot = (np.repeat(self.leaf_start[nd], counts) + np.arange(counts.sum())
+                        - np.repeat(np.cumsum(counts) - counts, counts))
+                other = self.order[slot]
+                keep = other != b
+                b, other = b[keep], other[keep]
+                add(b, pos[other] - pos[b], self.body_mass[other])
+
+            inner = near & ~leaf
+            kids = self.children[node[inner]]
+            body = np.repeat(body[inner], 8)
+            node = kids.ravel()
+            valid = node >= 0
+            body, node = body[valid], node[valid]
+        return acc
+
+
+class NBody:
+    """A gravitating system; step() advances it with leapfrog."""
+
+    def __init__(self, pos, vel, mass, G=1.0, softening=1e-3,
+                 method="auto", theta=0.5):
+        self.pos = np.array(pos, dtype=np.float64).reshape(-1, 3)
+        self.vel = np.array(vel, dtype=np.float64).reshape(-1, 3)
+        self.mass = np.array(mass, dtype=np.float64).reshape(-1)
+        self.G = G
+        self.softening = softening
+        self.theta = theta
+        if method == "auto":
+            method = "barnes-hut" if len(self.mass) > 2000 else "direct"
+        if method not in ("direct", "barnes-hut"):
+            raise ValueError(f"unknown force method: {method!r}")
+        self.method = method
+        self.time = 0.0
+        self.acc = self.accelerations()
+
+    def __len__(self):
+        return len(self.mass)
+
+    def accelerations(self, pos=None):
+        pos = self.pos if pos is None else pos
+        if self.method == "barnes-hut":
+            tree = Octree(pos, self.mass)
+            return tree.accelerations(pos, self.G, self.softening, self.theta)
+        return self._direct(pos)
+
+    def _direct(self, pos):
+        n = len(pos)
+        acc = np.empty((n, 3))
+        eps2 = self.softening ** 2
+        block = max(1, BLOCK_BYTES // (n * 3 * 8))
+        for i in range(0, n, block):
+            delta = pos[None, :, :] - pos[i:i + block, None, :]
+            r2 = np.einsum("ijk,ijk->ij", delta, delta) + eps2
+            w = self.mass / (r2 * np.sqrt(r2))
+            w[np.arange(len(w)), np.arange(i, i + len(w))] = 0
+            acc[i:i + block] = self.G * np.einsum("ij,ijk->ik", w, delta)
+        return acc
+
+    def step(self, dt):
+        """One kick-drift-kick leapfrog step (symplectic, time-reversible)."""
+        self.vel += 0.5 * dt * self.acc
+        self.pos += dt * self.vel
+        self.acc = self.accelerations()
+        self.vel += 0.5 * dt * self.acc
+        self.time += dt
+
+    def energy(self):
+        """Total energy (direct sum; meant for checks on small systems)."""
+        kinetic = 0.5 * np.sum(self.mass * np.einsum("ij,ij->i", self.vel, self.vel))
+        delta = self.pos[:, None, :] - self.pos[None, :, :]
+        r = np.sqrt(np.einsum("ijk,ijk->ij", delta, delta) + self.softening ** 2)
+        pair = self.mass[:, None] * self.mass[None, :] / r
+        np.fill_diagonal(pair, 0)
+        return kinetic - 0.5 * self.G * pair.sum()
+
+
+def simulate(system, steps, dt, out=None, every=1):
+    """Run `steps` steps and record every `every`-th position frame.
+
+    With out=None the frames are kept in memory; otherwise they are written
+    to a memory-mapped .npy file of shape (frames, N, 3), float32, which is
+    returned (open it later with np.load(out, mmap_mode="r")).
+    """
+    frames = steps // every + 1
+    shape = (frames, len(system), 3)
+    if out is None:
+        traj = np.empty(shape, dtype=np.float32)
+    else:
+        traj = np.lib.format.open_memmap(out, mode="w+", dtype=np.float32, shape=shape)
+    traj[0] = system.pos
+    for s in range(1, steps + 1):
+        system.step(dt)
+        if s % every == 0:
+            traj[s // every] = system.pos
+    if out is not None:
+        traj.flush()
+    return traj
+
+
+def random_disc(n, central_mass=1000.0, radius=50.0, G=1.0, seed=None):
+    """A heavy body at the origin plus n - 1 light bodies on circular orbits."""
+    rng = np.random.default_rng(seed)
+    r = radius * np.sqrt(rng.uniform(0.05, 1, n - 1))
+    phi = rng.uniform(0, 2 * np.pi, n - 1)
+    z = rng.normal(0, radius * 0.01, n - 1)
+    pos = np.column_stack((r * np.cos(phi), r * np.sin(phi), z))
+    speed = np.sqrt(G * central_mass / r)
+    vel = np.column_stack((-speed * np.sin(phi), speed * np.cos(phi), np.zeros(n - 1)))
+    mass = np.full(n - 1, central_mass * 1e-6)
+    return (np.vstack(([0, 0, 0], pos)), np.vstack(([0, 0, 0], vel)),
+            np.concatenate(([central_mass], mass)))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Headless N-body benchmark")
+    parser.add_argument("--bodies", type=int, default=10_000)
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--dt", type=float, default=0.01)
+    parser.add_argument("--method", default="auto",
+                        choices=("auto", "direct", "barnes-hut"))
+    parser.add_argument("--out", help="write the trajectory to this .npy file")
+    args = parser.parse_args()
+
+    system = NBody(*random_disc(args.bodies, seed=0), method=args.method)
+    start = time.perf_counter()
+    simulate(system, args.steps, args.dt, out=args.out)
+    elapsed = time.perf_counter() - start
+    print(f"{args.bodies} bodies, {args.steps} steps ({system.method}): "
+          f"{elapsed / args.steps * 1e3:.1f} ms/step")
@@ -0,0 +1,170 @@
+# Level-of-detail plotting for large 3D point clouds
+#
+# Point files are memory-mapped (.npy, or raw little-endian binary with a
+# fixed number of columns), so a 50M-point dump costs no RAM up front.
+# Before plotting, points are thinned with a voxel grid in NumPy: one point
+# is kept per occupied voxel, processed in chunks. When the 3D view is
+# zoomed, the points inside the new view are re-decimated with a finer
+# voxel, so detail appears as you zoom in.
+
+import time
+
+import numpy as np
+
+CHUNK = 5_000_000       # points quantized per pass
+BUDGET = 200_000        # points handed to matplotlib per view
+MAX_PASSES = 4          # full-data passes decimate may spend enlarging the voxel
+
+
+def load_points(path, dtype=np.float32, columns=3):
+    """Memory-map an (N, >=3) point array; returns the xyz columns (a view)."""
+    if str(path).endswith(".npy"):
+        data = np.load(path, mmap_mode="r")
+    else:
+        data = np.memmap(path, dtype=dtype, mode="r")
+        data = data.reshape(-1, columns)
+    return data[:, :3]
+
+
+def bounds_of(points, chunk=CHUNK):
+    lo = np.full(3, np.inf)
+    hi = np.full(3, -np.inf)
+    for i in range(0, len(points), chunk):
+        block = np.asarray(points[i:i + chunk])
+        lo = np.minimum(lo, block.min(axis=0))
+        hi = np.maximum(hi, block.max(axis=0))
+    return lo, hi
+
+
+def voxel_downsample(points, voxel, bounds=None, chunk=CHUNK):
+    """Keep the first point of every occupied voxel of edge `voxel`.
+
+    bounds=(lo, hi) restricts the result to that box (the current view).
+    """
+    if bounds is None:
+        bounds = bounds_of(points, chunk)
+    lo, hi = (np.asarray(b, dtype=np.float64) for b in bounds)
+    dims = np.maximum(np.ceil((hi - lo) / voxel).astype(np.int64), 1) + 1
+    keys, kept = [], []
+    for i in range(0, len(points), chunk):
+        block = np.asarray(points[i:i + chunk], dtype=np.float32)
+        inside = np.all((block >= lo) & (block <= hi), axis=1)
+        block = block[inside]
+        if not len(block):
+            continue
+        cell = ((block - lo) / voxel).astype(np.int64)
+        key = (cell[:, 0] * dims[1] + cell[:, 1]) * dims[2] + cell[:, 2]
+        key, first = np.unique(key, return_index=True)
+        keys.append(key)
+        kept.append(block[first])
+    if not keys:
+        return np.zeros((0, 3), dtype=np.float32)
+    key, first = np.unique(np.concatenate(keys), return_index=True)
+    return np.concatenate(kept)[first]
+
+
+def decimate(points, budget=BUDGET, bounds=None, chunk=CHUNK, sample=1_000_000):
+    """Voxel-downsample to roughly `budget` points.
+
+    The voxel size is tuned on a strided sample of at most `sample` points,
+    so the full data is usually only walked once. Flat axes (a planar or
+    linear cloud) are left out of the sizing, and if the result still
+    overshoots the budget the voxel is enlarged and the data walked again.
+    """
+    if bounds is None:
+        bounds = bounds_of(points, chunk)
+    lo, hi = bounds
+    extent = np.asarray(hi, dtype=np.float64) - np.asarray(lo, dtype=np.float64)
+    extent = extent[extent > 1e-9 * max(extent.max(), 1e-300)]
+    if not len(extent):
+        return voxel_downsample(points, 1.0, bounds, chunk)
+    dims = len(extent)
+    voxel = float(np.prod(extent) / budget) ** (1 / dims)
+    step = max(1, len(points) // sample)
+    probe = voxel_downsample(points[::step], voxel, bounds, chunk)
+    if 0 < len(probe) < budget / 4 and dims > 1:
+        # Points lie on surfaces or curves rather than filling the box:
+        # shrink the voxel as if the occupied voxels scale one dimension lower
+        voxel *= (len(probe) / budget) ** (1 / (dims - 1))
+    for _ in range(MAX_PASSES):
+        shown = voxel_downsample(points, voxel, bounds, chunk)
+        if len(shown) <= 2 * budget:
+            break
+        voxel *= (len(shown) / budget) ** (1 / dims)
+    return shown
+
+
+class LODPlot:
+    """A 3D scatter that re-decimates the memory-mapped points on zoom."""
+
+    def __init__(self, ax, points, budget=BUDGET, **scatter_kw):
+        self.ax = ax
+        self.points = points
+        self.budget = budget
+        self.full = bounds_of(points)
+        shown = decimate(points, budget, self.full)
+        self.scatter = ax.scatter(shown[:, 0], shown[:, 1], shown[:, 2], **scatter_kw)
+        self.view = self._view()
+        for event in ("button_release_event", "scroll_event"):
+            ax.figure.canvas.mpl_connect(event, self._refresh)
+
+    def _view(self):
+        ax = self.ax
+        return tuple(map(tuple, (ax.get_xlim3d(), ax.get_ylim3d(), ax.get_zlim3d())))
+
+    def _refresh(self, event=None):
+        view = self._view()
+        if view == self.view:
+            return
+        self.view = view
+        lo = np.maximum([v[0] for v in view], self.full[0])
+        hi = np.minimum([v[1] for v in view], self.full[1])
+        if np.any(lo >= hi):
+            return
+        shown = decimate(self.points, self.budget, (lo, hi))
+        self.scatter._offsets3d = (shown[:, 0], shown[:, 1], shown[:, 2])
+        self.ax.figure.canvas.draw_idle()
+
+
+def benchmark(sizes=(1_000_000, 10_000_000, 50_000_000), budget=BUDGET):
+    import os
+    import tempfile
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            path = os.path.join(tmp, f"points_{n}.npy")
+            out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(n, 3))
+            for i in range(0, n, CHUNK):
+                m = min(CHUNK, n - i)
+                # a noisy sphere shell, like a scanned surface
+                v = rng.normal(size=(m, 3))
+                v /= np.linalg.norm(v, axis=1, keepdims=True)
+                out[i:i + m] = v * (10 + rng.normal(0, 0.1, (m, 1)))
+            out.flush()
+            del out
+
+            start = time.perf_counter()
+            points = load_points(path)
+            t_load = time.perf_counter() - start
+            start = time.perf_counter()
+            full = bounds_of(points)
+            shown = decimate(points, budget, full)
+            t_full = time.perf_counter() - start
+            start = time.perf_counter()
+            zoom = decimate(points, budget, (np.full(3, 5.0), np.full(3, 10.0)))
+            t_zoom = time.perf_counter() - start
+            print(f"{n:>11,} points: mmap {t_load * 1e3:6.1f} ms, "
+                  f"overview {t_full:6.2f}s -> {len(shown):,}, "
+                  f"zoomed {t_zoom:6.2f}s -> {len(zoom):,}")
+            del points
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Point-cloud LOD timings")
+    parser.add_argument("sizes", nargs="*", type=int,
+                        default=[1_000_000, 10_000_000, 50_000_000])
+    args = parser.parse_args()
+    benchmark(args.sizes)
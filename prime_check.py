@@ -1,14 +1,46 @@
 # Check if a number is prime
+#
+#   python prime_check.py               -> asks for one number
+#   python prime_check.py numbers.txt   -> checks every number in the file
+#                                          (one per line, "-" for stdin)
 
-num = int(input("Enter a number: "))
-is_prime = True
+import sys
+import time
+from itertools import tee
 
-for i in range(2, num):
-    if num % i == 0:
-        is_prime = False
-        break
+from primes import is_prime, is_prime_many
 
-if is_prime and num > 1:
-    print("Prime")
-else:
-    print("Not Prime")
+
+def check_file(path):
+    f = sys.stdin if path == "-" else open(path)
+    numbers, to_check = tee(int(line) for line in f if line.strip())
+    out = sys.stdout
+    count = 0
+    start = last = time.perf_counter()
+    try:
+        for n, prime in zip(numbers, is_prime_many(to_check)):
+            out.write(f"{n} {'Prime' if prime else 'Not Prime'}\n")
+            count += 1
+            now = time.perf_counter()
+            if now - last >= 1:
+                print(f"{count} numbers, {count / (now - start):,.0f} numbers/sec",
+                      file=sys.stderr)
+                last = now
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    elapsed = time.perf_counter() - start
+    print(f"Checked {count} numbers in {elapsed:.2f}s "
+          f"({count / max(elapsed, 1e-9):,.0f} numbers/sec)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        check_file(sys.argv[1])
+    else:
+        num = int(input("Enter a number: "))
+
+        if is_prime(num):
+            print("Prime")
+        else:
+            print("Not Prime")
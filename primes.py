@@ -0,0 +1,225 @@
+# Prime numbers with a segmented Sieve of Eratosthenes
+#
+# Only odd numbers are sieved, one fixed-size NumPy segment at a time, so
+# memory stays flat no matter how far the range goes. Small numbers are
+# answered from a bit-packed table (one bit per odd number), bigger ones
+# with Miller-Rabin.
+
+import math
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+SEGMENT_SIZE = 1 << 21          # odd numbers per segment (~2 MB of flags)
+SMALL_LIMIT = 1 << 24           # is_prime() answers below this from a bit table
+CHUNK_SIZE = 10_000             # numbers per is_prime_many() task
+
+# These bases make Miller-Rabin exact for every n < 3.3 * 10**24 (> 2**64)
+DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+_small_bits = None
+
+
+def base_primes(limit):
+    """Return all primes <= limit as an int64 array (simple odd-only sieve)."""
+    if limit < 2:
+        return np.zeros(0, dtype=np.int64)
+    flags = np.ones((limit + 1) // 2, dtype=bool)   # flags[i] -> 2*i + 1
+    flags[0] = False
+    for i in range(1, (math.isqrt(limit) - 1) // 2 + 1):
+        if flags[i]:
+            p = 2 * i + 1
+            flags[p * p // 2::p] = False
+    primes = 2 * np.flatnonzero(flags).astype(np.int64) + 1
+    return np.concatenate(([2], primes))
+
+
+def _odd_segments(start, stop, segment_size):
+    """Yield (lo, flags) where flags[i] tells whether lo + 2*i is prime.
+
+    lo is always odd and the same flags buffer is reused for every segment,
+    so callers must copy anything they want to keep.
+    """
+    lo = max(start, 1) | 1
+    if lo >= stop:
+        return
+    sieving = base_primes(math.isqrt(stop - 1))[1:]
+    buffer = np.empty(segment_size, dtype=bool)
+    while lo < stop:
+        hi = min(lo + 2 * segment_size, stop)
+        flags = buffer[:(hi - lo + 1) // 2]
+        flags[:] = True
+        if lo == 1:
+            flags[0] = False
+        for p in sieving[sieving * sieving < hi].tolist():
+            m = max(p * p, -(-lo // p) * p)
+            if m % 2 == 0:
+                m += p
+            flags[(m - lo) // 2::p] = False
+        yield lo, flags
+        lo = hi | 1
+
+
+def iter_segments(start, stop, segment_size=SEGMENT_SIZE):
+    """Yield the primes in [start, stop) as one int64 array per segment."""
+    if start <= 2 < stop:
+        yield np.array([2], dtype=np.int64)
+    for lo, flags in _odd_segments(start, stop, segment_size):
+        yield lo + 2 * np.flatnonzero(flags).astype(np.int64)
+
+
+def primerange(start, stop, segment_size=SEGMENT_SIZE):
+    """Generate the primes in [start, stop) one Python int at a time."""
+    for segment in iter_segments(start, stop, segment_size):
+        yield from segment.tolist()
+
+
+def count_primes(stop, start=0, segment_size=SEGMENT_SIZE):
+    """Count the primes in [start, stop)."""
+    total = 1 if start <= 2 < stop else 0
+    for _, flags in _odd_segments(start, stop, segment_size):
+        total += int(np.count_nonzero(flags))
+    return total
+
+
+def _small_table():
+    global _small_bits
+    if _small_bits is None:
+        flags = np.zeros(SMALL_LIMIT // 2, dtype=bool)
+        flags[(base_primes(SMALL_LIMIT - 1)[1:] // 2)] = True
+        _small_bits = np.packbits(flags)
+    return _small_bits
+
+
+def miller_rabin(n, rounds=None):
+    """Miller-Rabin test for an odd n > 37.
+
+    Exact for n < 2**64. Above that `rounds` random bases are tried
+    (default 20), so a composite slips through with chance < 4**-rounds.
+    """
+    d = n - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    if n < 1 << 64:
+        bases = DETERMINISTIC_BASES
+    else:
+        rng = random.Random(n)
+        bases = [rng.randrange(2, n - 1) for _ in range(rounds or 20)]
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_prime(n, rounds=None):
+    """Tell whether n is prime (see miller_rabin() for n >= 2**64)."""
+    if n < 2:
+        return False
+    if n % 2 == 0:
+        return n == 2
+    if n < SMALL_LIMIT:
+        i = n // 2
+        return bool(_small_table()[i >> 3] & (0x80 >> (i & 7)))
+    return miller_rabin(n, rounds)
+
+
+def _check_chunk(chunk, rounds=None):
+    return [is_prime(n, rounds) for n in chunk]
+
+
+def is_prime_many(numbers, rounds=None, processes=None, chunk_size=CHUNK_SIZE):
+    """Yield is_prime(n) for every n in numbers, in input order.
+
+    The input is consumed lazily in chunks that are spread across a
+    process pool; at most two chunks per worker are in flight, so huge
+    inputs (files, generators) never have to fit in memory.
+    processes=1 runs everything in the calling process.
+    """
+    numbers = iter(numbers)
+    chunks = iter(lambda: list(islice(numbers, chunk_size)), [])
+    if processes == 1:
+        for chunk in chunks:
+            yield from _check_chunk(chunk, rounds)
+        return
+    workers = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_check_chunk, chunk, rounds))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+# -------------------------------------------------------
+# Benchmark against the trial-division loop in prime_check.py
+# -------------------------------------------------------
+
+def _trial_loop(num, budget):
+    """Run prime_check.py's loop on num for at most budget seconds.
+
+    Returns the (possibly extrapolated) time for the whole loop.
+    """
+    step = 1 << 20
+    t0 = time.perf_counter()
+    done = 0
+    for lo in range(2, num, step):
+        for i in range(lo, min(lo + step, num)):
+            if num % i == 0:
+                return time.perf_counter() - t0
+        done = min(lo + step, num) - 2
+        elapsed = time.perf_counter() - t0
+        if elapsed > budget:
+            return elapsed * (num - 2) / done
+    return time.perf_counter() - t0
+
+
+def benchmark(sizes=(10**6, 10**8, 10**10), budget=5.0):
+    print(f"{'N':>14} {'pi(N)':>12} {'sieve count':>12} "
+          f"{'is_prime(p)':>12} {'loop(p)':>12}")
+    for n in sizes:
+        t0 = time.perf_counter()
+        pi = count_primes(n)
+        t_count = time.perf_counter() - t0
+
+        p = n - 1
+        while not is_prime(p):
+            p -= 1
+        t0 = time.perf_counter()
+        is_prime(p)
+        t_check = time.perf_counter() - t0
+
+        t_loop = _trial_loop(p, budget)
+        print(f"{n:>14} {pi:>12} {t_count:>11.3f}s "
+              f"{t_check * 1e3:>10.3f}ms {t_loop:>11.3f}s")
+    print(f"(loop times above {budget:.0f}s are extrapolated; "
+          "p is the largest prime below N)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Segmented prime sieve")
+    parser.add_argument("--count", type=int, metavar="N",
+                        help="count the primes below N")
+    parser.add_argument("--bench", action="store_true",
+                        help="compare the sieve to the trial-division loop")
+    args = parser.parse_args()
+
+    if args.count is not None:
+        print(count_primes(args.count))
+    if args.bench:
+        benchmark()
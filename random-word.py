@@ -8,5 +8,29 @@ def generate_word():
     word = random.choice(prefixes) + random.choice(middles) + random.choice(suffixes)
     return word.capitalize()
 
-for _ in range(5):
-    print(generate_word())
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    from word_generator import benchmark, write_words
+
+    parser = argparse.ArgumentParser(description="Make up pronounceable words")
+    parser.add_argument("count", nargs="?", type=int, default=5)
+    parser.add_argument("output", nargs="?", help="write count unique words to this file")
+    parser.add_argument("--middles", type=int, help="middle parts per word (default: enough)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--bench", action="store_true")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(prefixes, middles, suffixes, args.count)
+    elif args.output:
+        stats = write_words(args.output, args.count, prefixes, middles, suffixes,
+                            args.middles, args.seed, report=sys.stderr)
+        print(f"{stats['words']:,} words in {stats['seconds']:.2f}s "
+              f"({stats['words_per_sec']:,.0f}/sec), {stats['middles']} middles, "
+              f"{stats['coverage']:.2%} of {stats['space']:,} combinations used, "
+              f"{stats['dedup']} dedup (false positive rate {stats['false_positive_rate']:.2g})")
+    else:
+        for _ in range(args.count):
+            print(generate_word())
@@ -1,7 +1,17 @@
 import re
+import sys
 
 text = "Python is fun also powerfull"
 
 clcoding = re.findall(r"Python", text)
 
 print(clcoding)
+
+# Same search over big files: python re-findall.py dump.txt [more.txt ...]
+# (the files are memory-mapped and matches are printed as they are found)
+if len(sys.argv) > 1:
+    from mmap_regex import finditer
+
+    for path in sys.argv[1:]:
+        for start, end in finditer(path, r"Python"):
+            print(f"{path}:{start}-{end}")
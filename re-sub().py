@@ -1,6 +1,14 @@
 import re
+import sys
 
 text = "Love you Babe"
 
 clcoding = re.sub(r"Babe", "Chad 🌒", text)
-print(clcoding)
\ No newline at end of file
+print(clcoding)
+
+# Same substitution over a big file, streamed into a new one:
+#   python "re-sub().py" letters.txt letters-fixed.txt
+if len(sys.argv) == 3:
+    from mmap_regex import sub_file
+
+    print(sub_file(sys.argv[1], sys.argv[2], r"Babe", "Chad 🌒"), "replaced")
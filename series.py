@@ -0,0 +1,122 @@
+# Closed-form sums of series
+#
+# sum_n.py, ODD_Numbers/ and the chapter exercises add numbers one by one;
+# the formulas here answer the same questions in O(1), even for N = 10**12.
+# There is also a NumPy path for masked ranges and a batch mode for many
+# (start, stop, step) ranges at once.
+
+from fractions import Fraction
+from functools import lru_cache
+from math import comb
+
+import numpy as np
+
+CHUNK_SIZE = 1 << 20
+_INT64_SAFE = 3 * 10**9         # |values| below this can't overflow count * value
+
+
+def range_sum(start, stop=None, step=1):
+    """Return sum(range(start, stop, step)) without looping."""
+    if stop is None:
+        start, stop = 0, start
+    r = range(start, stop, step)
+    if not r:
+        return 0
+    return len(r) * (r[0] + r[-1]) // 2
+
+
+def sum_to(n):
+    """Return 1 + 2 + ... + n."""
+    return n * (n + 1) // 2 if n > 0 else 0
+
+
+def odd_count(n):
+    """How many odd numbers are in 1..n."""
+    return (n + 1) // 2 if n > 0 else 0
+
+
+def odd_sum(n):
+    """Return 1 + 3 + 5 + ... up to n (the sum of the first k odds is k*k)."""
+    k = odd_count(n)
+    return k * k
+
+
+@lru_cache(maxsize=None)
+def bernoulli(m):
+    """Return the Bernoulli number B_m (with B_1 = +1/2) as a Fraction."""
+    if m == 0:
+        return Fraction(1)
+    return 1 - sum(comb(m, k) * bernoulli(k) / (m - k + 1) for k in range(m))
+
+
+def power_sum(n, p):
+    """Return 1**p + 2**p + ... + n**p with Faulhaber's formula."""
+    if n <= 0:
+        return 0
+    if p == 0:
+        return n
+    total = sum(comb(p + 1, k) * bernoulli(k) * n ** (p + 1 - k)
+                for k in range(p + 1))
+    return int(total / (p + 1))
+
+
+def masked_sum(start, stop, mask, step=1, chunk_size=CHUNK_SIZE):
+    """Sum the numbers of range(start, stop, step) selected by mask.
+
+    mask is either a boolean array with one entry per number in the range,
+    or a function that takes a NumPy chunk of the range and returns a
+    boolean array for it (e.g. ``lambda x: x % 3 == 0``). The range is
+    walked in chunks, so memory stays flat for huge ranges.
+    """
+    r = range(start, stop, step)
+    total = 0
+    for i in range(0, len(r), chunk_size):
+        part = r[i:i + chunk_size]
+        values = np.arange(part.start, part.stop, part.step, dtype=np.int64)
+        keep = mask(values) if callable(mask) else np.asarray(mask)[i:i + len(part)]
+        values = values[keep]
+        if values.size and np.abs(values).max() < _INT64_SAFE:
+            total += int(values.sum())
+        else:
+            total += sum(values.tolist())
+    return total
+
+
+def sum_ranges(queries):
+    """Answer many range sums at once.
+
+    queries is an (k, 3) array-like of (start, stop, step) rows with the
+    same meaning as range(); returns a list of k exact Python ints.
+    """
+    q = np.asarray(queries, dtype=np.int64).reshape(-1, 3)
+    start, stop, step = q[:, 0], q[:, 1], q[:, 2]
+    if not step.all():
+        raise ValueError("sum_ranges() step must not be zero")
+    count = np.maximum(0, (stop - start + step - np.sign(step)) // step)
+    last = start + (count - 1) * step
+    if len(q) and max(np.abs(start).max(), np.abs(last).max()) < _INT64_SAFE:
+        sums = count * (start + last) // 2
+        sums[count == 0] = 0
+        return sums.tolist()
+    count, start, last = (a.astype(object) for a in (count, start, last))
+    sums = count * (start + last) // 2
+    return [s if c else 0 for s, c in zip(sums.tolist(), count.tolist())]
+
+
+if __name__ == "__main__":
+    import time
+
+    n = 10**12
+    print("1..10**12      =", sum_to(n))
+    print("odds up to it  =", odd_sum(n))
+    print("squares        =", power_sum(n, 2))
+    print("multiples of 7 below 10**7 =",
+          masked_sum(0, 10**7, lambda x: x % 7 == 0))
+
+    rng = np.random.default_rng(0)
+    starts = rng.integers(0, 10**9, 100_000)
+    queries = np.column_stack((starts, starts + rng.integers(1, 10**6, 100_000),
+                               rng.integers(1, 10, 100_000)))
+    t0 = time.perf_counter()
+    sum_ranges(queries)
+    print(f"100k batch queries in {time.perf_counter() - t0:.3f}s")
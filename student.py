@@ -11,7 +11,8 @@ class Student:
         print("Age:", self.age)
         print("Department:", self.dept)
 
-# object create
-s1 = Student("Mahin", 22, "CSE")
+if __name__ == "__main__":
+    # object create
+    s1 = Student("Mahin", 22, "CSE")
 
-s1.display()
\ No newline at end of file
+    s1.display()
@@ -0,0 +1,480 @@
+# Columnar student registry with secondary indexes
+#
+# student.Student and friends keep one object (and one __dict__) per
+# student. For a roster of millions, StudentRegistry stores the columns in
+# NumPy arrays instead: ids and ages as integers, departments as small
+# codes into an intern table, and names as one UTF-8 byte blob plus
+# offsets. On top of the columns it keeps
+#
+#   * an open-addressing hash table from student id to row,
+#   * per-department posting lists (rows grouped by department code),
+#   * an age index (rows sorted by age, with one offset per age value),
+#
+# and StudentView, a __slots__ row view with the old display()/show() API.
+# dump()/load() write and memory-map a binary snapshot, so startup does
+# not re-parse the CSV.
+
+import csv
+import os
+import time
+
+import numpy as np
+
+MAGIC = b"STUDREG1"
+EMPTY = np.uint32(0xFFFFFFFF)       # free slot in the id hash table
+FIB = 0x9E3779B97F4A7C15            # Fibonacci hashing multiplier
+HEADER_FIELDS = ("rows", "name_bytes", "depts", "dept_bytes", "table_bits")
+
+
+def _hash(ids, bits):
+    """Slot numbers for an int64 id array in a table of 2**bits slots."""
+    return (ids.astype(np.uint64) * np.uint64(FIB)) >> np.uint64(64 - bits)
+
+
+def _table_bits(rows):
+    """Smallest table that keeps the load factor at or below 1/2."""
+    return max(4, (2 * rows - 1).bit_length())
+
+
+def build_id_table(ids):
+    """Linear-probing hash table (keys, rows) for unique int64 ids."""
+    bits = _table_bits(len(ids))
+    keys = np.zeros(1 << bits, dtype=np.int64)
+    rows = np.full(1 << bits, EMPTY, dtype=np.uint32)
+    insert_ids(keys, rows, ids, np.arange(len(ids)))
+    return keys, rows
+
+
+def insert_ids(keys, rows, ids, row_numbers):
+    """Insert new, unique ids into the table in place, all at once.
+
+    Every round, each pending id tries its current slot, one id wins each
+    free slot and the rest probe onward.
+    """
+    mask = len(keys) - 1
+    pending = np.arange(len(ids))
+    slot = _hash(ids, mask.bit_length()).astype(np.int64)
+    while len(pending):
+        free = rows[slot] == EMPTY
+        taken, first = np.unique(slot[free], return_index=True)
+        winners = pending[free][first]
+        rows[taken] = row_numbers[winners]
+        keys[taken] = ids[winners]
+        placed = np.zeros(len(pending), dtype=bool)
+        placed[np.flatnonzero(free)[first]] = True
+        pending = pending[~placed]
+        slot = (slot[~placed] + 1) & mask
+
+
+def _pack_strings(strings):
+    """(offsets, blob) for a list of str: string i is blob[offsets[i]:offsets[i+1]]."""
+    encoded = [s.encode() for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.uint64, count=len(encoded)),
+              out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def _layout(header):
+    """Byte offset and (dtype, count) of every snapshot section, 8-byte aligned."""
+    rows, name_bytes, depts, dept_bytes, bits = (header[f] for f in HEADER_FIELDS)
+    sections = [
+        ("ids", np.int64, rows),
+        ("ages", np.uint8, rows),
+        ("dept_codes", np.uint16, rows),
+        ("name_offsets", np.uint64, rows + 1),
+        ("name_blob", np.uint8, name_bytes),
+        ("dept_offsets", np.uint64, depts + 1),
+        ("dept_blob", np.uint8, dept_bytes),
+        ("id_keys", np.int64, 1 << bits),
+        ("id_rows", np.uint32, 1 << bits),
+    ]
+    offset = len(MAGIC) + 8 * len(HEADER_FIELDS)
+    layout = {}
+    for name, dtype, count in sections:
+        layout[name] = (offset, dtype, count)
+        offset += -(-count * np.dtype(dtype).itemsize // 8) * 8
+    return layout, offset
+
+
+class StudentRegistry:
+    def __init__(self):
+        self.rows = 0
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.ages = np.zeros(0, dtype=np.uint8)
+        self.dept_codes = np.zeros(0, dtype=np.uint16)
+        self.name_offsets = np.zeros(1, dtype=np.uint64)
+        self.name_blob = np.zeros(0, dtype=np.uint8)
+        self.name_bytes = 0
+        self.dept_names = []
+        self.dept_index = {}
+        self.id_keys, self.id_rows = build_id_table(self.ids)
+        self.next_id = 1
+        self._by_dept = None         # (rows ordered by dept, start per dept)
+        self._by_age = None          # (rows ordered by age, start per age)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.rows:
+            raise IndexError(row)
+        return StudentView(self, row)
+
+    def __iter__(self):
+        return (StudentView(self, row) for row in range(self.rows))
+
+    # -- adding students ------------------------------------------------
+
+    def _dept_code(self, name):
+        if name not in self.dept_index:
+            self.dept_index[name] = len(self.dept_names)
+            self.dept_names.append(name)
+        return self.dept_index[name]
+
+    def _reserve(self, rows, name_bytes):
+        """Make room for more rows/name bytes (also makes loaded snapshots writable)."""
+        need = self.rows + rows
+        if need > len(self.ids) or not self.ids.flags.writeable:
+            capacity = max(need, 2 * len(self.ids), 1024)
+            for column in ("ids", "ages", "dept_codes"):
+                old = getattr(self, column)
+                grown = np.zeros(capacity, dtype=old.dtype)
+                grown[:self.rows] = old[:self.rows]
+                setattr(self, column, grown)
+            grown = np.zeros(capacity + 1, dtype=np.uint64)
+            grown[:self.rows + 1] = self.name_offsets[:self.rows + 1]
+            self.name_offsets = grown
+        need = self.name_bytes + name_bytes
+        if need > len(self.name_blob) or not self.name_blob.flags.writeable:
+            grown = np.zeros(max(need, 2 * len(self.name_blob), 1 << 16), dtype=np.uint8)
+            grown[:self.name_bytes] = self.name_blob[:self.name_bytes]
+            self.name_blob = grown
+
+    def add(self, name, age, dept, student_id=None):
+        """Add one student; returns its StudentView."""
+        return self[self.add_many([name], [age], [dept],
+                                  None if student_id is None else [student_id])[0]]
+
+    def add_many(self, names, ages, depts, ids=None):
+        """Append columns of students; returns the range of new rows.
+
+        ids defaults to consecutive numbers after the largest id so far.
+        Duplicate ids raise ValueError and nothing is added.
+        """
+        names = list(names)
+        n = len(names)
+        if ids is None:
+            ids = np.arange(self.next_id, self.next_id + n, dtype=np.int64)
+        ids = np.asarray(ids, dtype=np.int64)
+        ages = np.asarray(ages, dtype=np.int64)
+        if len(ids) != n or len(ages) != n:
+            raise ValueError("names, ages, depts and ids must have the same length")
+        if np.any((ages < 0) | (ages > 255)):
+            raise ValueError("age must be between 0 and 255")
+        if len(np.unique(ids)) != n or np.any(self.rows_for_ids(ids) >= 0):
+            raise ValueError("duplicate student id")
+        codes = np.fromiter((self._dept_code(d) for d in depts), dtype=np.uint16, count=n)
+        offsets, blob = _pack_strings(names)
+
+        self._reserve(n, len(blob))
+        start, stop = self.rows, self.rows + n
+        self.ids[start:stop] = ids
+        self.ages[start:stop] = ages
+        self.dept_codes[start:stop] = codes
+        self.name_offsets[start + 1:stop + 1] = offsets[1:] + np.uint64(self.name_bytes)
+        self.name_blob[self.name_bytes:self.name_bytes + len(blob)] = blob
+        self.name_bytes += len(blob)
+        self.rows = stop
+        if n:
+            self.next_id = max(self.next_id, int(ids.max()) + 1)
+        self._index_ids(start, stop)
+        self._by_dept = self._by_age = None
+        return range(start, stop)
+
+    def _index_ids(self, start, stop):
+        if 2 * self.rows > len(self.id_keys):
+            self.id_keys, self.id_rows = build_id_table(self.ids[:self.rows])
+            return
+        if not self.id_keys.flags.writeable:
+            self.id_keys, self.id_rows = self.id_keys.copy(), self.id_rows.copy()
+        insert_ids(self.id_keys, self.id_rows, self.ids[start:stop], np.arange(start, stop))
+
+    # -- lookups --------------------------------------------------------
+
+    def rows_for_ids(self, ids):
+        """Row of every id in an array of ids, -1 where the id is unknown."""
+        ids = np.asarray(ids, dtype=np.int64)
+        mask = len(self.id_keys) - 1
+        slot = _hash(ids, mask.bit_length()).astype(np.int64)
+        found = np.full(len(ids), -1, dtype=np.int64)
+        active = np.arange(len(ids))
+        while len(active):
+            rows = self.id_rows[slot]
+            hit = (rows != EMPTY) & (self.id_keys[slot] == ids[active])
+            found[active[hit]] = rows[hit]
+            going = (rows != EMPTY) & ~hit
+            active, slot = active[going], (slot[going] + 1) & mask
+        return found
+
+    def by_id(self, student_id):
+        row = int(self.rows_for_ids([student_id])[0])
+        if row < 0:
+            raise KeyError(student_id)
+        return StudentView(self, row)
+
+    def in_dept(self, dept):
+        """Rows of every student in a department, in insertion order."""
+        if dept not in self.dept_index:
+            return np.zeros(0, dtype=np.int64)
+        if self._by_dept is None:
+            self._by_dept = self._postings(self.dept_codes, len(self.dept_names))
+        order, starts = self._by_dept
+        code = self.dept_index[dept]
+        return order[starts[code]:starts[code + 1]]
+
+    def aged_between(self, low, high):
+        """Rows of students with low <= age <= high, ordered by age."""
+        if self._by_age is None:
+            self._by_age = self._postings(self.ages, 256)
+        order, starts = self._by_age
+        low, high = max(int(low), 0), min(int(high), 255)
+        if low > high:
+            return np.zeros(0, dtype=np.int64)
+        return order[starts[low]:starts[high + 1]]
+
+    def _postings(self, codes, size):
+        codes = codes[:self.rows]
+        order = np.argsort(codes, kind="stable")
+        starts = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=size), out=starts[1:])
+        return order, starts
+
+    def name(self, row):
+        a, b = self.name_offsets[row], self.name_offsets[row + 1]
+        return bytes(self.name_blob[a:b]).decode()
+
+    def view(self, rows):
+        return [StudentView(self, int(row)) for row in rows]
+
+    # -- CSV and snapshots ----------------------------------------------
+
+    @classmethod
+    def from_csv(cls, path, chunk_size=100_000):
+        """Read a CSV with name, age, dept and (optionally) id columns."""
+        registry = cls()
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = [h.strip().lower() for h in next(reader)]
+            col = {h: i for i, h in enumerate(header)}
+            batch = []
+            for record in reader:
+                batch.append(record)
+                if len(batch) == chunk_size:
+                    registry._add_records(batch, col)
+                    batch = []
+            registry._add_records(batch, col)
+        return registry
+
+    def _add_records(self, records, col):
+        if not records:
+            return
+        columns = list(zip(*records))
+        ids = columns[col["id"]] if "id" in col else None
+        self.add_many(columns[col["name"]], np.array(columns[col["age"]], dtype=np.int64),
+                      columns[col["dept"]], None if ids is None else np.array(ids, dtype=np.int64))
+
+    def dump(self, path):
+        """Write a binary snapshot atomically; load() memory-maps it."""
+        dept_offsets, dept_blob = _pack_strings(self.dept_names)
+        header = {"rows": self.rows, "name_bytes": self.name_bytes,
+                  "depts": len(self.dept_names), "dept_bytes": len(dept_blob),
+                  "table_bits": len(self.id_keys).bit_length() - 1}
+        layout, size = _layout(header)
+        sections = {
+            "ids": self.ids[:self.rows], "ages": self.ages[:self.rows],
+            "dept_codes": self.dept_codes[:self.rows],
+            "name_offsets": self.name_offsets[:self.rows + 1],
+            "name_blob": self.name_blob[:self.name_bytes],
+            "dept_offsets": dept_offsets, "dept_blob": dept_blob,
+            "id_keys": self.id_keys, "id_rows": self.id_rows,
+        }
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + np.array([header[k] for k in HEADER_FIELDS], "<u8").tobytes())
+            for name, (offset, dtype, count) in layout.items():
+                f.seek(offset)
+                np.ascontiguousarray(sections[name], dtype=dtype).tofile(f)
+            f.truncate(size)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a snapshot; columns stay on disk until touched."""
+        data = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(data[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a student registry snapshot")
+        fields = data[len(MAGIC):len(MAGIC) + 8 * len(HEADER_FIELDS)].view("<u8")
+        header = dict(zip(HEADER_FIELDS, map(int, fields)))
+        layout, size = _layout(header)
+        if len(data) < size:
+            raise ValueError(f"{path} is truncated")
+        sections = {}
+        for name, (offset, dtype, count) in layout.items():
+            nbytes = count * np.dtype(dtype).itemsize
+            sections[name] = data[offset:offset + nbytes].view(dtype)
+
+        registry = cls()
+        registry.rows = header["rows"]
+        registry.name_bytes = header["name_bytes"]
+        for name in ("ids", "ages", "dept_codes", "name_offsets", "name_blob",
+                     "id_keys", "id_rows"):
+            setattr(registry, name, sections[name])
+        offsets, blob = sections["dept_offsets"], bytes(sections["dept_blob"])
+        registry.dept_names = [blob[offsets[i]:offsets[i + 1]].decode()
+                               for i in range(header["depts"])]
+        registry.dept_index = {d: i for i, d in enumerate(registry.dept_names)}
+        if registry.rows:
+            registry.next_id = int(registry.ids.max()) + 1
+        return registry
+
+
+class StudentView:
+    """One row of a StudentRegistry, with the Student classes' methods."""
+
+    __slots__ = ("registry", "row")
+
+    def __init__(self, registry, row):
+        self.registry = registry
+        self.row = row
+
+    @property
+    def id(self):
+        return int(self.registry.ids[self.row])
+
+    @property
+    def name(self):
+        return self.registry.name(self.row)
+
+    @property
+    def age(self):
+        return int(self.registry.ages[self.row])
+
+    @property
+    def dept(self):
+        return self.registry.dept_names[self.registry.dept_codes[self.row]]
+
+    def display(self):
+        print("Name:", self.name)
+        print("Age:", self.age)
+        print("Department:", self.dept)
+
+    def show(self):
+        print("Name:", self.name)
+        print("Age:", self.age)
+
+    def greet(self):
+        print("Hello", self.name)
+
+    def __repr__(self):
+        return f"StudentView(id={self.id}, name={self.name!r}, age={self.age}, dept={self.dept!r})"
+
+
+def benchmark(students=2_000_000, lookups=100_000):
+    import tempfile
+    import tracemalloc
+
+    from student import Student
+
+    rng = np.random.default_rng(0)
+    depts = ["CSE", "EEE", "BBA", "Civil", "Math", "Physics", "English", "Law"]
+    names = [f"Student {i}" for i in range(students)]
+    ages = rng.integers(17, 30, students)
+    dept_of = [depts[i] for i in rng.integers(0, len(depts), students)]
+    query = rng.integers(1, students + 1, lookups)
+
+    tracemalloc.start()
+    objects = [Student(n, a, d) for n, a, d in zip(names, ages.tolist(), dept_of)]
+    objects_mb = tracemalloc.get_traced_memory()[0] / 1e6
+    by_id = {i + 1: s for i, s in enumerate(objects)}
+    tracemalloc.stop()
+    start = time.perf_counter()
+    cse = [s for s in objects if s.dept == "CSE"]
+    young = [s for s in objects if 20 <= s.age <= 22]
+    found = [by_id[i] for i in query.tolist()]
+    t_objects = time.perf_counter() - start
+
+    tracemalloc.start()
+    registry = StudentRegistry()
+    registry.add_many(names, ages, dept_of)
+    registry_mb = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    start = time.perf_counter()
+    rows_cse = registry.in_dept("CSE")
+    rows_young = registry.aged_between(20, 22)
+    rows_found = registry.rows_for_ids(query)
+    t_registry = time.perf_counter() - start
+    assert len(rows_cse) == len(cse) and len(rows_young) == len(young)
+    assert registry[int(rows_found[0])].name == found[0].name
+
+    print(f"{students:,} students: objects {objects_mb:,.0f} MB, registry {registry_mb:,.0f} MB")
+    print(f"dept + age range + {lookups:,} id lookups: objects {t_objects:.3f}s, "
+          f"registry {t_registry:.3f}s (first query builds the indexes)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "roster.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "name", "age", "dept"])
+            writer.writerows(zip(range(1, students + 1), names, ages.tolist(), dept_of))
+        start = time.perf_counter()
+        StudentRegistry.from_csv(path)
+        t_csv = time.perf_counter() - start
+        snapshot = os.path.join(tmp, "roster.students")
+        registry.dump(snapshot)
+        start = time.perf_counter()
+        loaded = StudentRegistry.load(snapshot)
+        loaded.by_id(int(query[0]))
+        t_load = time.perf_counter() - start
+        print(f"startup: CSV import {t_csv:.2f}s, snapshot load + first lookup "
+              f"{t_load * 1e3:.1f} ms")
+        del loaded
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Columnar student registry")
+    parser.add_argument("--bench", type=int, metavar="STUDENTS",
+                        help="compare with a list of student.Student objects")
+    parser.add_argument("--csv", help="import a CSV (name,age,dept[,id])")
+    parser.add_argument("--snapshot", help="load this snapshot, or write it after --csv")
+    parser.add_argument("--dept", help="list the students of a department")
+    parser.add_argument("--ages", nargs=2, type=int, metavar=("LOW", "HIGH"))
+    parser.add_argument("--id", type=int, help="show one student")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(args.bench)
+    else:
+        if args.csv:
+            registry = StudentRegistry.from_csv(args.csv)
+            if args.snapshot:
+                registry.dump(args.snapshot)
+        elif args.snapshot:
+            registry = StudentRegistry.load(args.snapshot)
+        else:
+            parser.error("give --bench, --csv or --snapshot")
+        print(f"{len(registry):,} students, {len(registry.dept_names)} departments")
+        if args.id is not None:
+            registry.by_id(args.id).display()
+        rows = None
+        if args.dept:
+            rows = registry.in_dept(args.dept)
+        if args.ages:
+            aged = registry.aged_between(*args.ages)
+            rows = aged if rows is None else np.intersect1d(rows, aged)
+        if rows is not None:
+            for student in registry.view(np.sort(rows)[:20]):
+                print(student)
+            print(f"{len(rows):,} matching")
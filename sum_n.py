@@ -1,9 +1,8 @@
 # Calculate sum from 1 to N
 
-n = int(input("Enter a number: "))
-total = 0
+from series import sum_to
 
-for i in range(1, n + 1):
-    total += i
+n = int(input("Enter a number: "))
+total = sum_to(n)
 
 print("Sum =", total)
@@ -0,0 +1,326 @@
+# Offline spelling correction with a symmetric-delete index
+#
+# SymSpell's idea: instead of generating every edit of a misspelled word
+# (millions for distance 2), index every *delete* of every dictionary
+# word once. A query only needs its own deletes; any dictionary word that
+# shares a delete with it is a candidate, checked with a real edit
+# distance.
+#
+# The index is saved as one file of flat arrays and memory-mapped on load:
+#   words / word_offsets   dictionary words as one UTF-8 blob + offsets
+#   counts                 corpus frequency of every word
+#   keys / postings        64-bit hash of each delete (sorted) -> word id
+# so opening a large dictionary costs almost nothing, and a lookup is a
+# few binary searches in `keys`.
+
+import hashlib
+import json
+import os
+import re
+import time
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+MAGIC = b"SYMSPELL"
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "symspell")
+WORD_RE = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+
+def _key(text):
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+def deletes(word, max_distance):
+    """word plus every string made by deleting up to max_distance characters."""
+    found = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - found
+        found |= frontier
+    return found
+
+
+def edit_distance(a, b, limit):
+    """Optimal string alignment distance (adjacent swaps count 1), or limit + 1.
+
+    The common prefix and suffix are dropped first, and only cells within
+    `limit` of the diagonal are computed.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        return max(len(a), len(b)) if max(len(a), len(b)) <= limit else limit + 1
+    big = limit + 1
+    previous2 = None
+    previous = [j if j <= limit else big for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        current = [big] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        for j in range(low, high + 1):
+            d = min(previous[j] + 1, current[j - 1] + 1,
+                    previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if (previous2 is not None and j > 1 and a[i - 1] == b[j - 2]
+                    and a[i - 2] == b[j - 1] and previous2[j - 2] + 1 < d):
+                d = previous2[j - 2] + 1
+            current[j] = d
+        if min(current[low:high + 1]) > limit:
+            return big
+        previous2, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else big
+
+
+def word_counts(path, min_count=1):
+    """Word frequencies of a text corpus (lowercased)."""
+    counts = Counter()
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            counts.update(WORD_RE.findall(line.lower()))
+    return {w: c for w, c in counts.items() if c >= min_count}
+
+
+def _save(path, meta, arrays):
+    """One file: magic, JSON header length + header, then 8-byte aligned arrays."""
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        layout[name] = {"dtype": array.dtype.str, "count": len(array), "offset": offset}
+        offset += -(-array.nbytes // 8) * 8
+    header = json.dumps({"meta": meta, "arrays": layout}).encode()
+    header += b" " * (-(len(MAGIC) + 8 + len(header)) % 8)
+    base = len(MAGIC) + 8 + len(header)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + len(header).to_bytes(8, "little") + header)
+        for name, array in arrays.items():
+            f.seek(base + layout[name]["offset"])
+            array.tofile(f)
+        f.truncate(base + offset)
+    os.replace(tmp, path)
+
+
+def _load(path):
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"{path} is not a SymSpell index")
+    size = int.from_bytes(bytes(data[len(MAGIC):len(MAGIC) + 8]), "little")
+    base = len(MAGIC) + 8 + size
+    header = json.loads(bytes(data[len(MAGIC) + 8:base]))
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        start = base + spec["offset"]
+        # plain ndarray views of the map: no memmap subclass cost per slice
+        arrays[name] = data[start:start + spec["count"] * dtype.itemsize].view(np.ndarray).view(dtype)
+    return header["meta"], arrays
+
+
+def build_index(path, counts, max_distance=2, prefix_length=7):
+    """Write the symmetric-delete index of a {word: count} dictionary to path."""
+    words = sorted(counts)
+    encoded = [w.encode() for w in words]
+    offsets = np.zeros(len(words) + 1, dtype=np.uint64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    keys, postings = [], []
+    for word_id, word in enumerate(words):
+        for d in deletes(word[:prefix_length], max_distance):
+            keys.append(_key(d))
+            postings.append(word_id)
+    keys = np.array(keys, dtype=np.uint64)
+    postings = np.array(postings, dtype=np.uint32)
+    order = np.argsort(keys, kind="stable")
+    _save(path, {"max_distance": max_distance, "prefix_length": prefix_length}, {
+        "words": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "word_offsets": offsets,
+        "counts": np.array([counts[w] for w in words], dtype=np.uint64),
+        "keys": keys[order],
+        "postings": postings[order],
+    })
+
+
+class SymSpell:
+    """Corrects words against a memory-mapped index written by build_index()."""
+
+    def __init__(self, path, cache_size=100_000):
+        meta, arrays = _load(path)
+        self.max_distance = meta["max_distance"]
+        self.prefix_length = meta["prefix_length"]
+        self.words = arrays["words"]
+        self.offsets = arrays["word_offsets"]
+        self.counts = arrays["counts"]
+        self.keys = arrays["keys"]
+        self.postings = arrays["postings"]
+        self.lengths = np.diff(self.offsets).tolist()   # bytes, = chars for ASCII
+        self.correct = lru_cache(maxsize=cache_size)(self._correct)
+
+    @classmethod
+    def for_corpus(cls, corpus, max_distance=2, min_count=1, cache_dir=CACHE_DIR, **kw):
+        """Open the index of a text corpus, building it on first use.
+
+        The index is cached under a key made from the corpus path, size,
+        modification time and the settings, so an edited corpus is rebuilt.
+        """
+        st = os.stat(corpus)
+        text = f"{os.path.abspath(corpus)}|{st.st_size}|{st.st_mtime_ns}|{max_distance}|{min_count}"
+        os.makedirs(cache_dir, exist_ok=True)
+        path = os.path.join(cache_dir, hashlib.sha1(text.encode()).hexdigest()[:16] + ".idx")
+        if not os.path.exists(path):
+            build_index(path, word_counts(corpus, min_count), max_distance)
+        return cls(path, **kw)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def word(self, word_id):
+        return self.words[self.offsets[word_id]:self.offsets[word_id + 1]].tobytes().decode()
+
+    def candidates(self, strings):
+        """Ids of dictionary words with a delete equal to one of strings."""
+        hashes = np.array([_key(d) for d in strings], dtype=np.uint64)
+        lo = np.searchsorted(self.keys, hashes, "left").tolist()
+        hi = np.searchsorted(self.keys, hashes, "right").tolist()
+        found = set()
+        for a, b in zip(lo, hi):
+            if b > a:
+                found.update(self.postings[a:b].tolist())
+        return found
+
+    def lookup(self, word, max_distance=None):
+        """[(suggestion, distance, count)] of the closest words, most frequent first.
+
+        The query's deletes are tried one level at a time (0, 1, 2 ...
+        characters removed). A word at distance d always shares a delete
+        made with at most d removals, so once the best distance found is
+        <= the level just searched, deeper levels cannot do better.
+        """
+        limit = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        seen = set()
+        found = []
+        level = {word[:self.prefix_length]}
+        done = set()
+        for depth in range(limit + 1):
+            ids = self.candidates(level) - seen
+            seen |= ids
+            for word_id in ids:
+                # a length difference above the limit can never be within reach
+                if abs(self.lengths[word_id] - len(word)) > limit:
+                    continue
+                candidate = self.word(word_id)
+                distance = edit_distance(word, candidate, limit)
+                if distance <= limit:
+                    found.append((candidate, distance, int(self.counts[word_id])))
+                    limit = distance
+            if found and limit <= depth:
+                break
+            done |= level
+            level = {w[:i] + w[i + 1:] for w in level for i in range(len(w))} - done
+        best = min((f[1] for f in found), default=None)
+        found = [f for f in found if f[1] == best]
+        found.sort(key=lambda f: -f[2])
+        return found
+
+    def _correct(self, word):
+        lower = word.lower()
+        found = self.lookup(lower)
+        if not found or found[0][0] == lower:
+            return word
+        best = found[0][0]
+        if word.isupper() and len(word) > 1:
+            return best.upper()
+        if word[:1].isupper():
+            return best.capitalize()
+        return best
+
+    def correct_many(self, words):
+        """Correct a batch; repeated words are looked up once."""
+        fixed = {w: self.correct(w) for w in dict.fromkeys(words)}
+        return [fixed[w] for w in words]
+
+    def correct_text(self, text):
+        """Correct every word of text, keeping punctuation and spacing."""
+        return re.sub(r"[A-Za-z]+(?:'[A-Za-z]+)?", lambda m: self.correct(m.group()), text)
+
+
+def benchmark(corpus, samples=20_000, textblob_samples=500, seed=0):
+    """Correct randomly misspelled corpus words; TextBlob too when installed."""
+    import random
+    import tempfile
+
+    start = time.perf_counter()
+    counts = word_counts(corpus)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.idx")
+        build_index(path, counts)
+        built = time.perf_counter() - start
+        start = time.perf_counter()
+        speller = SymSpell(path)
+        opened = time.perf_counter() - start
+        print(f"{len(counts):,} words indexed in {built:.1f}s "
+              f"({len(speller.keys):,} deletes), opened in {opened * 1e3:.1f} ms")
+
+        rng = random.Random(seed)
+        vocabulary = [w for w in counts if len(w) > 3]
+        weights = [counts[w] for w in vocabulary]
+        truth = rng.choices(vocabulary, weights, k=samples)
+        letters = "abcdefghijklmnopqrstuvwxyz"
+        typos = []
+        for w in truth:
+            i = rng.randrange(len(w))
+            edit = rng.choice(("delete", "insert", "replace", "swap"))
+            if edit == "delete":
+                w = w[:i] + w[i + 1:]
+            elif edit == "insert":
+                w = w[:i] + rng.choice(letters) + w[i:]
+            elif edit == "replace":
+                w = w[:i] + rng.choice(letters) + w[i + 1:]
+            elif i + 1 < len(w):
+                w = w[:i] + w[i + 1] + w[i] + w[i + 2:]
+            typos.append(w)
+
+        start = time.perf_counter()
+        fixed = speller.correct_many(typos)
+        elapsed = time.perf_counter() - start
+        right = sum(f == t for f, t in zip(fixed, truth)) / samples
+        print(f"symspell: {samples / elapsed:,.0f} words/sec, {right:.1%} restored")
+        start = time.perf_counter()
+        speller.correct_many(typos)
+        print(f"symspell (cached): {samples / (time.perf_counter() - start):,.0f} words/sec")
+
+    try:
+        from textblob import Word
+    except ImportError:
+        print("textblob not installed, skipping the comparison")
+        return
+    sample = typos[:textblob_samples]
+    start = time.perf_counter()
+    fixed = [str(Word(w).correct()) for w in sample]
+    elapsed = time.perf_counter() - start
+    right = sum(f == t for f, t in zip(fixed, truth)) / len(sample)
+    print(f"textblob: {len(sample) / elapsed:,.0f} words/sec, {right:.1%} restored "
+          "(its own dictionary, not the corpus)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Offline spelling correction")
+    parser.add_argument("corpus", help="text file the dictionary is counted from")
+    parser.add_argument("text", nargs="*", help="text to correct (default: benchmark)")
+    parser.add_argument("--distance", type=int, default=2)
+    args = parser.parse_args()
+
+    if args.text:
+        speller = SymSpell.for_corpus(args.corpus, args.distance)
+        print(speller.correct_text(" ".join(args.text)))
+    else:
+        benchmark(args.corpus)
@@ -0,0 +1,82 @@
+# Double-buffered ANSI frame renderer for terminal animations
+#
+# The renderer keeps the previous frame in memory. Each frame it writes
+# only the cells that changed (with ANSI cursor moves) and flushes once,
+# instead of clearing the screen and reprinting the whole grid.
+
+import sys
+
+CSI = "\x1b["
+
+
+class ByteCounter:
+    """A write-only stream that just counts bytes, for headless runs."""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, text):
+        self.bytes += len(text.encode("utf-8"))
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+class FrameRenderer:
+    """Draw a width x height grid of cells, each cell_width columns wide.
+
+    Usage per frame: clear(), put() the visible things, render().
+    A cell holds a string that fills exactly cell_width terminal columns
+    (an emoji is two columns wide, so it fits a cell_width of 2).
+    """
+
+    def __init__(self, width, height, out=None, cell_width=2):
+        self.width = width
+        self.height = height
+        self.cell_width = cell_width
+        self.blank = " " * cell_width
+        self.out = out if out is not None else sys.stdout
+        self.front = [[None] * width for _ in range(height)]    # on screen
+        self.back = [[self.blank] * width for _ in range(height)]
+        self.frames = 0
+        self.bytes_written = 0
+        self.last_frame_bytes = 0
+
+    def clear(self):
+        blank = self.blank
+        for row in self.back:
+            row[:] = [blank] * self.width
+
+    def put(self, row, col, cell):
+        if 0 <= row < self.height and 0 <= col < self.width:
+            self.back[row][col] = cell
+
+    def render(self):
+        """Write the differences to the terminal; return bytes written."""
+        parts = []
+        if self.frames == 0:
+            parts.append(f"{CSI}?25l{CSI}2J")        # hide cursor, clear once
+        cw = self.cell_width
+        for r, (old, new) in enumerate(zip(self.front, self.back)):
+            cursor = -1
+            for c in range(self.width):
+                cell = new[c]
+                if cell != old[c]:
+                    if c != cursor:
+                        parts.append(f"{CSI}{r + 1};{c * cw + 1}H")
+                    parts.append(cell)
+                    old[c] = cell
+                    cursor = c + 1
+        text = "".join(parts)
+        self.out.write(text)
+        self.out.flush()
+        self.frames += 1
+        self.last_frame_bytes = len(text.encode("utf-8"))
+        self.bytes_written += self.last_frame_bytes
+        return self.last_frame_bytes
+
+    def close(self):
+        """Show the cursor again and park it below the grid."""
+        self.out.write(f"{CSI}{self.height + 1};1H{CSI}?25h\n")
+        self.out.flush()
@@ -0,0 +1,30 @@
+import numpy as np
+
+from ball_swarm import BallSwarm
+
+
+def _approaching_contacts(swarm):
+    i, j = swarm._candidate_pairs()
+    delta = swarm.pos[i] - swarm.pos[j]
+    dist2 = np.einsum("ij,ij->i", delta, delta)
+    approach = np.einsum("ij,ij->i", swarm.vel[i] - swarm.vel[j], delta)
+    return int(((dist2 < (2 * swarm.radius) ** 2) & (dist2 > 0) & (approach < 0)).sum())
+
+
+def test_ball_with_several_contacts_is_resolved():
+    swarm = BallSwarm(3, 10, 10, collide=True, seed=0)
+    swarm.pos[:] = [[5.0, 5.0], [5.8, 5.0], [4.2, 5.0]]
+    swarm.vel[:] = [[0.0, 0.0], [-1.0, 0.0], [1.0, 0.0]]
+    swarm._collide()
+    assert swarm.collisions >= 2
+    assert _approaching_contacts(swarm) == 0
+    assert np.isclose((swarm.vel ** 2).sum(), 2.0)
+
+
+def test_dense_scene_resolves_contacts_and_conserves_energy():
+    swarm = BallSwarm(2000, 40, 10, collide=True, seed=0)
+    energy = (swarm.vel ** 2).sum()
+    for _ in range(50):
+        swarm.step()
+    assert swarm.collisions > 10_000
+    assert np.isclose((swarm.vel ** 2).sum(), energy)
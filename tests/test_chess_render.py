@@ -0,0 +1,16 @@
+import pytest
+
+matplotlib = pytest.importorskip("matplotlib")
+
+from chess_render import Board, render_batch
+
+
+def test_in_process_render_keeps_the_callers_backend(tmp_path):
+    before = matplotlib.get_backend()
+    matplotlib.use("svg")
+    try:
+        paths = render_batch([Board(str(tmp_path / "b.png"), highlights=[(0, 0)])], processes=1)
+        assert matplotlib.get_backend() == "svg"
+        assert open(paths[0], "rb").read(8) == b"\x89PNG\r\n\x1a\n"
+    finally:
+        matplotlib.use(before)
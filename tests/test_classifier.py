@@ -0,0 +1,20 @@
+from classifier import PhraseClassifier, read_messages
+
+
+def test_read_messages_handles_bad_json_and_odd_fields(tmp_path):
+    path = tmp_path / "posts.jsonl"
+    path.write_text('{not json, click here\n'
+                    '{"text": null}\n'
+                    '{"text": 42}\n'
+                    '{"other": "x"}\n'
+                    '{"text": "Buy now"}\n'
+                    'plain line\n', encoding="utf-8")
+    assert list(read_messages(str(path))) == [
+        "{not json, click here", "", "42", "", "Buy now", "plain line"]
+
+
+def test_classify_accepts_non_string_messages():
+    classifier = PhraseClassifier({"spam": ["click here"], "number": ["42"]})
+    assert classifier.classify(None) == {}
+    assert classifier.classify(42) == {"number": ["42"]}
+    assert classifier.classify("CLICK HERE") == {"spam": ["click here"]}
@@ -0,0 +1,22 @@
+import pytest
+
+from concurrent_bank import AccountStore
+
+
+@pytest.mark.parametrize("amount", [0, -5])
+def test_non_positive_amounts_are_rejected(amount):
+    store = AccountStore(2, opening_balance=10)
+    with pytest.raises(ValueError):
+        store.deposit(0, amount)
+    with pytest.raises(ValueError):
+        store.withdraw(0, amount)
+    with pytest.raises(ValueError):
+        store.transfer(0, 1, amount)
+    assert store.balances == [10, 10]
+
+
+def test_transfer_checks_source_funds():
+    store = AccountStore(2, opening_balance=10)
+    assert store.transfer(0, 1, 10)
+    assert not store.transfer(0, 1, 1)
+    assert store.balances == [0, 20]
@@ -0,0 +1,49 @@
+import time
+
+import numpy as np
+import pytest
+
+from expression import compile_expression, evaluate
+
+
+@pytest.mark.parametrize("source", [
+    "(10**10000)**10000",
+    "9**9**9",
+    "2**100001",
+    "(10**20000) * (10**20000)",
+    "x ** 1000000",
+])
+def test_huge_integer_results_are_rejected_quickly(source):
+    start = time.perf_counter()
+    with pytest.raises(ValueError):
+        evaluate(source, x=10**200)
+    assert time.perf_counter() - start < 1
+
+
+def test_big_but_bounded_integers_still_work():
+    assert evaluate("2**1000 * 3") == 3 * 2**1000
+    assert evaluate("2**60000") == 2**60000
+    assert evaluate("(-2)**99999") == (-2)**99999
+    assert evaluate("1**10**9") == 1
+    assert evaluate("2**-2") == 0.25
+
+
+@pytest.mark.parametrize("source", ["min(1)", "abs(1, 2)", "max(1, 2, 3)", "sqrt()"])
+def test_wrong_number_of_arguments_is_a_value_error(source):
+    with pytest.raises(ValueError):
+        compile_expression(source)
+
+
+def test_functions_and_arrays():
+    assert evaluate("max(a, 2) + abs(-1)", a=np.array([1, 5])).tolist() == [3, 6]
+
+
+@pytest.mark.parametrize("source", [
+    "(" * 5000 + "1" + ")" * 5000,
+    "-" * 5000 + "1",
+    "1" + "+1" * 50000,
+    "2**" * 3000 + "1",
+])
+def test_deep_nesting_is_a_value_error(source):
+    with pytest.raises(ValueError):
+        evaluate(source)
@@ -0,0 +1,139 @@
+import os
+
+import numpy as np
+
+from bank_account import BankAccount
+from ledger import HEADER, RECORD, Ledger, read_journal, rebuild_balances
+
+
+def test_torn_tail_is_truncated_on_open(tmp_path):
+    path = str(tmp_path / "bank.ledger")
+    ledger = Ledger(path)
+    a = ledger.open_account("a", 100)
+    ledger.close()
+    with open(path, "ab") as f:
+        f.write(b"\x01" * (RECORD.itemsize // 2))      # crash mid-record
+
+    ledger = Ledger(path)
+    ledger.open_account("a")
+    b = ledger.open_account("b")
+    ledger.deposit(a, 5)
+    ledger.deposit(b, 7)
+    ledger.close()
+
+    assert os.path.getsize(path) == HEADER + 3 * RECORD.itemsize
+    assert read_journal(path)["seq"].tolist() == [0, 1, 2]
+    assert rebuild_balances(path).tolist() == [105, 7]
+
+
+def test_torn_header_starts_a_new_journal(tmp_path):
+    path = str(tmp_path / "bank.ledger")
+    with open(path, "wb") as f:
+        f.write(b"LEDG")
+    ledger = Ledger(path)
+    ledger.deposit(ledger.open_account("a"), 3)
+    ledger.close()
+    assert rebuild_balances(path).tolist() == [3]
+
+
+def test_bank_account_commits_each_operation(tmp_path):
+    path = str(tmp_path / "bank.ledger")
+    acc = BankAccount("Mahin", 1000, Ledger(path, fsync_interval=3600))
+    acc.deposit(500)
+    acc.withdraw(300)
+    # nothing closed: the records must already be on disk
+    assert rebuild_balances(path).tolist() == [1200]
+
+
+def test_restart_does_not_deposit_opening_balance_again(tmp_path):
+    path = str(tmp_path / "bank.ledger")
+    ledger = Ledger(path)
+    acc = BankAccount("Mahin", 1000, ledger)
+    acc.deposit(500)
+    ledger.close()
+
+    ledger = Ledger(path)
+    acc = BankAccount("Mahin", 1000, ledger)
+    assert acc.balance == 1500
+    assert ledger.balance(acc.account_id) == 1500
+    other = BankAccount("Nusrat", 200, ledger)
+    assert other.balance == 200
+    ledger.close()
+    assert rebuild_balances(path).tolist() == [1500, 200]
+
+
+def test_close_is_idempotent(tmp_path):
+    ledger = Ledger(str(tmp_path / "bank.ledger"))
+    ledger.open_account("a", 1)
+    ledger.close()
+    ledger.close()
+    assert np.array_equal(rebuild_balances(str(tmp_path / "bank.ledger")), [1])
+
+
+def _sequential(balances, accounts, amounts):
+    balances = balances.copy()
+    accepted = []
+    for a, v in zip(accounts.tolist(), amounts.tolist()):
+        ok = v != 0 and balances[a] + v >= 0
+        if ok:
+            balances[a] += v
+        accepted.append(ok)
+    return accepted
+
+
+def test_many_rejections_on_one_account_are_fast_and_exact():
+    import time
+
+    from ledger import validate_batch
+
+    rng = np.random.default_rng(0)
+    n = 20_000
+    accounts = np.zeros(n, dtype=np.uint32)
+    amounts = np.where(rng.random(n) < 0.1, 3, -5).astype(np.int64)
+    balances = np.array([10], dtype=np.int64)
+    start = time.perf_counter()
+    accepted = validate_batch(balances, accounts, amounts)
+    assert time.perf_counter() - start < 2
+    assert accepted.tolist() == _sequential(balances, accounts, amounts)
+    assert (~accepted).sum() > 10_000
+
+
+def test_validate_batch_matches_one_by_one_processing():
+    from ledger import validate_batch
+
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        n = int(rng.integers(1, 300))
+        accounts = rng.integers(0, 5, n).astype(np.uint32)
+        amounts = rng.integers(-20, 15, n).astype(np.int64)
+        balances = rng.integers(0, 30, 5).astype(np.int64)
+        assert validate_batch(balances, accounts, amounts).tolist() == \
+            _sequential(balances, accounts, amounts)
+
+
+def test_ledger_rejects_non_positive_amounts(tmp_path):
+    import pytest
+
+    ledger = Ledger(str(tmp_path / "bank.ledger"))
+    a = ledger.open_account("a", 100)
+    for amount in (0, -1000):
+        with pytest.raises(ValueError):
+            ledger.deposit(a, amount)
+        with pytest.raises(ValueError):
+            ledger.withdraw(a, amount)
+    assert ledger.balance(a) == 100
+    ledger.close()
+
+
+def test_bank_account_follows_the_ledger(tmp_path):
+    import pytest
+
+    ledger = Ledger(str(tmp_path / "bank.ledger"))
+    acc = BankAccount("Mahin", 100, ledger)
+    with pytest.raises(ValueError):
+        acc.deposit(-500)
+    assert acc.balance == ledger.balance(acc.account_id) == 100
+    ledger.withdraw(acc.account_id, 80)          # someone else spends from the ledger
+    acc.withdraw(50)
+    assert acc.balance == 100 and ledger.balance(acc.account_id) == 20
+    ledger.close()
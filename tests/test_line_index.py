@@ -0,0 +1,52 @@
+import random
+import re
+
+import pytest
+
+from line_index import LineIndex
+
+
+def _reference(lines, pattern):
+    regex = re.compile(pattern)
+    return [(n, line) for n, line in enumerate(lines, 1) if regex.search(line)]
+
+
+@pytest.fixture
+def text_file(tmp_path):
+    rng = random.Random(0)
+    lines = [b" ".join(rng.choices([b"a", b"b", b"ab", b"ba", b"c"], k=rng.randint(0, 5)))
+             for _ in range(2_000)]
+    path = tmp_path / "log.txt"
+    path.write_bytes(b"\n".join(lines) + b"\n")
+    return str(path), lines
+
+
+@pytest.mark.parametrize("pattern", [rb"^a", rb"b$", rb"^$", rb"\s", rb"a\s+b", rb"c\sa$", rb"ab"])
+@pytest.mark.parametrize("segment", [1, 37, 500, 1 << 20])
+def test_grep_is_per_line_and_independent_of_segments(text_file, pattern, segment):
+    path, lines = text_file
+    with LineIndex(path, cache=False) as index:
+        assert list(index.grep(pattern, segment=segment)) == _reference(lines, pattern)
+
+
+def test_grep_without_trailing_newline(tmp_path):
+    path = tmp_path / "t.txt"
+    path.write_bytes(b"x a\nb\nlast a")
+    with LineIndex(str(path), cache=False) as index:
+        assert list(index.grep(rb"a$")) == [(1, b"x a"), (3, b"last a")]
+        assert list(index.grep(rb"^b$")) == [(2, b"b")]
+
+
+def test_cache_is_rebuilt_when_the_file_changes(tmp_path):
+    import os
+
+    path = tmp_path / "t.txt"
+    path.write_bytes(b"one\ntwo\n")
+    with LineIndex(str(path)) as index:
+        assert not index.cached and index[1] == b"two"
+    with LineIndex(str(path)) as index:
+        assert index.cached
+    path.write_bytes(b"one\ntwo\nthree\n")
+    os.utime(path, ns=(1, 1))
+    with LineIndex(str(path)) as index:
+        assert not index.cached and len(index) == 3 and index[-1] == b"three"
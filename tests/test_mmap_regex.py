@@ -0,0 +1,54 @@
+import random
+import re
+
+import pytest
+
+import mmap_regex
+from mmap_regex import sub_file
+
+
+@pytest.fixture
+def dump(tmp_path):
+    rng = random.Random(0)
+    words = [b"Python", b"is", b"fun", b"pythonic", b"code", b"snake"]
+    path = tmp_path / "dump.txt"
+    path.write_bytes(b" ".join(rng.choices(words, k=20_000)))
+    return path
+
+
+@pytest.mark.parametrize("repl", [b"Snake", rb"<\g<0>>", lambda m: m.group().upper()])
+@pytest.mark.parametrize("buffer_size", [1, 64, 1 << 20])
+def test_sub_file_matches_re_sub(dump, tmp_path, repl, buffer_size):
+    pattern = rb"\b[Pp]ython\w*"
+    out = tmp_path / "out.txt"
+    n = sub_file(dump, out, pattern, repl, buffer_size=buffer_size)
+    expected, count = re.subn(pattern, repl, dump.read_bytes())
+    assert out.read_bytes() == expected and n == count
+
+
+def test_sub_file_writes_once_buffer_size_is_reached(dump, tmp_path, monkeypatch):
+    writes = []
+
+    class Recorder:
+        def __init__(self, f):
+            self.f = f
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return self.f.__exit__(*exc)
+
+        def write(self, b):
+            writes.append(len(b))
+            return self.f.write(b)
+
+        def __getattr__(self, name):
+            return getattr(self.f, name)
+
+    fdopen = mmap_regex.os.fdopen
+    monkeypatch.setattr(mmap_regex.os, "fdopen", lambda *a: Recorder(fdopen(*a)))
+    sub_file(dump, tmp_path / "out.txt", rb"\w+", b"x", buffer_size=256)
+    # each flush holds at most one match and gap past the threshold
+    assert max(writes) < 256 + 64
+    assert len(writes) > 100
@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from pointcloud import decimate
+
+
+@pytest.mark.parametrize("flat", [(2,), (1, 2)])
+def test_flat_cloud_is_decimated_to_the_budget(flat):
+    rng = np.random.default_rng(0)
+    points = rng.random((400_000, 3)).astype(np.float32)
+    points[:, list(flat)] = 0.5
+    shown = decimate(points, budget=20_000)
+    assert 10_000 <= len(shown) <= 40_000
+
+
+def test_volume_and_single_point_clouds():
+    rng = np.random.default_rng(1)
+    points = rng.random((400_000, 3)).astype(np.float32)
+    assert 10_000 <= len(decimate(points, budget=20_000)) <= 40_000
+    assert len(decimate(np.ones((1_000, 3), dtype=np.float32), budget=20_000)) == 1
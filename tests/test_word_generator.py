@@ -0,0 +1,40 @@
+from word_generator import WordSpace, write_words
+
+
+def test_ambiguous_parts_are_detected():
+    assert not WordSpace(["x"], ["a", "ab"], ["c", "bc"]).unambiguous
+    assert WordSpace(["x"], ["a", "b"], ["c", "d"]).unambiguous
+
+
+def test_words_are_unique_strings_when_parts_overlap(tmp_path):
+    path = tmp_path / "words.txt"
+    # "a" + "bc" and "ab" + "c" spell the same word
+    stats = write_words(str(path), 5, ["x"], ["a", "ab", "b"], ["c", "bc", "d"],
+                        middle_count=1, seed=1)
+    words = path.read_text().split()
+    assert len(words) == stats["words"] == 5
+    assert len(set(words)) == 5
+
+
+def test_asking_for_more_words_than_exist_fails(tmp_path):
+    import pytest
+
+    with pytest.raises(ValueError):
+        # 4 combinations but only 3 different words
+        write_words(str(tmp_path / "w.txt"), 4, ["x"], ["a", "ab"], ["c", "bc"], middle_count=1)
+
+
+def test_unambiguous_space_writes_every_combination_once(tmp_path):
+    path = tmp_path / "words.txt"
+    write_words(str(path), 16, ["pre", "bi"], ["ka", "lo"], ["tion", "ly"], middle_count=2, seed=3)
+    words = path.read_text().split()
+    assert len(words) == len(set(words)) == 16
+
+
+def test_bitmap_only_when_it_is_not_much_bigger_than_the_words():
+    from word_generator import Bitmap, BloomFilter, seen_set
+
+    few = seen_set(1 << 32, 10)
+    assert isinstance(few, BloomFilter) and few.bits.nbytes < 1024
+    assert isinstance(seen_set(1 << 20, 10_000), Bitmap)
+    assert isinstance(seen_set(100, 100), Bitmap)
@@ -0,0 +1,16 @@
+import pytest
+
+from word_mash import split_pairs
+
+
+@pytest.mark.parametrize("text, pairs", [
+    ("alpha beta\ngamma delta\n", [("alpha", "beta"), ("gamma", "delta")]),
+    ("alpha beta\ngamma delta", [("alpha", "beta"), ("gamma", "delta")]),
+    ("alpha beta gamma\ndelta\n", []),
+    ("a b\n\nc d e f\n", [("a", "b")]),
+    ("a  b\n\tc d\r\n", [("a", "b"), ("c", "d")]),
+    ("", []),
+])
+def test_split_pairs_skips_malformed_lines(text, pairs):
+    firsts, seconds = split_pairs(text)
+    assert list(zip(firsts, seconds)) == pairs
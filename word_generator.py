@@ -0,0 +1,247 @@
+# Bulk generator of unique made-up words
+#
+# random-word.py glues one prefix, one middle and one suffix together with
+# three random.choice calls, which only gives len(prefixes) * len(middles)
+# * len(suffixes) words (810 with its lists). WordSpace allows several
+# middles in a row and numbers every combination, so a word is just an
+# integer in range(space.size). Words are made by drawing those integers
+# with NumPy in large batches and looking them up in two precomputed
+# tables (prefix + leading middles, trailing middles + suffix).
+#
+# Uniqueness is tracked per combination number: an exact bitmap when the
+# space is small enough, otherwise a Bloom filter. A Bloom filter false
+# positive only drops a word that was never produced; it can never let a
+# duplicate through. Distinct numbers only mean distinct words when the
+# parts can be split one way ("a" + "bc" and "ab" + "c" cannot); WordSpace
+# checks that up front, and write_words() also remembers the words
+# themselves when it does not hold.
+
+import math
+import time
+
+import numpy as np
+
+BITMAP_LIMIT = 1 << 32      # spaces up to this size (512 MiB of bits) may use a bitmap
+BITMAP_BYTES_PER_WORD = 32  # ... if it costs at most this much per requested word
+BATCH = 1 << 20
+
+
+def _mix(x):
+    """splitmix64 finalizer over a uint64 array (wraps like the C version)."""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class Bitmap:
+    """Exact set of integers in range(size)."""
+
+    def __init__(self, size):
+        self.size = size
+        self.bits = np.zeros((size + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def add_new(self, values):
+        """Add distinct values; returns the mask of those that were not yet present."""
+        byte, bit = values >> 3, (values & 7).astype(np.uint8)
+        new = (self.bits[byte] >> bit) & 1 == 0
+        np.bitwise_or.at(self.bits, byte[new], np.left_shift(1, bit[new]).astype(np.uint8))
+        self.count += int(new.sum())
+        return new
+
+    def false_positive_rate(self):
+        return 0.0
+
+
+class BloomFilter:
+    """Probabilistic set sized for `capacity` items at `error` false positives."""
+
+    def __init__(self, capacity, error=1e-3):
+        self.m = max(64, int(-capacity * math.log(error) / math.log(2) ** 2))
+        self.k = max(1, round(self.m / capacity * math.log(2)))
+        self.bits = np.zeros((self.m + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def _positions(self, values):
+        h1 = _mix(values.astype(np.uint64))
+        h2 = _mix(h1) | np.uint64(1)
+        i = np.arange(self.k, dtype=np.uint64)
+        return (h1[:, None] + i * h2[:, None]) % np.uint64(self.m)
+
+    def add_new(self, values):
+        """Add distinct values; returns the mask of those that were (probably) new."""
+        pos = self._positions(values)
+        byte, bit = pos >> np.uint64(3), (pos & np.uint64(7)).astype(np.uint8)
+        new = ~np.all((self.bits[byte] >> bit) & 1, axis=1)
+        np.bitwise_or.at(self.bits, byte[new].ravel(),
+                         np.left_shift(1, bit[new].ravel()).astype(np.uint8))
+        self.count += int(new.sum())
+        return new
+
+    def false_positive_rate(self):
+        """Current chance that an unseen value is reported as seen."""
+        return (1 - math.exp(-self.k * self.count / self.m)) ** self.k
+
+
+class WordSpace:
+    """All words prefix + `middles` middle parts + suffix, numbered 0..size-1."""
+
+    def __init__(self, prefixes, middles, suffixes, middle_count=1):
+        self.middle_count = middle_count
+        head_middles = middle_count // 2
+        tail_middles = middle_count - head_middles
+        self.head = self._table([prefixes] + [middles] * head_middles)
+        self.tail = self._table([middles] * tail_middles + [suffixes])
+        self.head = [w.capitalize() for w in self.head]
+        self.size = len(self.head) * len(self.tail)
+        self.unambiguous = self._unambiguous(self.head, self.tail)
+
+    @staticmethod
+    def _unambiguous(head, tail):
+        """True if every (head, tail) pair gives a different word.
+
+        h1 + t1 == h2 + t2 with h1 != h2 needs one head to be a prefix of
+        the other, so distinct tails and prefix-free heads are enough (or
+        the same the other way round). In sorted order a prefix sits right
+        before some word it starts, so neighbours are all that is checked.
+        """
+        def prefix_free(words):
+            ordered = sorted(words)
+            return not any(b.startswith(a) for a, b in zip(ordered, ordered[1:]))
+
+        def distinct(words):
+            return len(set(words)) == len(words)
+
+        return ((distinct(tail) and prefix_free(head))
+                or (distinct(head) and prefix_free([w[::-1] for w in tail])))
+
+    @staticmethod
+    def _table(parts):
+        words = [""]
+        for choices in parts:
+            words = [w + c for w in words for c in choices]
+        return words
+
+    @classmethod
+    def fitting(cls, prefixes, middles, suffixes, count, headroom=2):
+        """Fewest middles giving at least headroom * count combinations."""
+        middle_count = 1
+        while len(prefixes) * len(middles) ** middle_count * len(suffixes) < headroom * count:
+            middle_count += 1
+        return cls(prefixes, middles, suffixes, middle_count)
+
+    def words(self, numbers):
+        head, tail = np.divmod(numbers, len(self.tail))
+        h, t = self.head, self.tail
+        return [h[a] + t[b] for a, b in zip(head.tolist(), tail.tolist())]
+
+
+def seen_set(space_size, capacity, error=1e-3):
+    """Bitmap when it is about as small as a set of `capacity` numbers, else a Bloom filter.
+
+    The bitmap costs space_size / 8 bytes whatever the count, so a few
+    words from a 2**32 space get a Bloom filter rather than 512 MiB.
+    Without the bitmap the space is at least 256 times `capacity`, so
+    the filter's false positives never starve the draw.
+    """
+    if space_size <= BITMAP_LIMIT and space_size // 8 <= BITMAP_BYTES_PER_WORD * capacity:
+        return Bitmap(space_size)
+    return BloomFilter(capacity, error)
+
+
+def unique_numbers(space_size, count, seen, seed=None, batch=BATCH):
+    """Yield arrays of distinct random numbers below space_size, `count` in total.
+
+    `seen` (a Bitmap or BloomFilter) remembers what was already produced.
+    """
+    if count > space_size:
+        raise ValueError(f"only {space_size:,} combinations, cannot make {count:,} unique words")
+    if space_size > 1 << 63:
+        raise ValueError("combination space too large, use fewer middles")
+    rng = np.random.default_rng(seed)
+    made = 0
+    while made < count:
+        # draw extra to make up for repeats as the space fills
+        fill = seen.count / space_size
+        size = int(min(batch, (count - made) / max(1 - fill, 1e-3) * 1.05) + 16)
+        drawn = rng.integers(0, space_size, size, dtype=np.uint64)
+        _, first = np.unique(drawn, return_index=True)
+        drawn = drawn[np.sort(first)]
+        fresh = drawn[seen.add_new(drawn)][:count - made]
+        made += len(fresh)
+        yield fresh
+
+
+def write_words(path, count, prefixes, middles, suffixes, middle_count=None,
+                seed=None, batch=BATCH, report=None):
+    """Write `count` unique words to path, one per line; returns a stats dict.
+
+    middle_count=None picks the fewest middles that leave the space at
+    least half empty. The same seed and parts give the same file.
+    """
+    if middle_count is None:
+        space = WordSpace.fitting(prefixes, middles, suffixes, count)
+    else:
+        space = WordSpace(prefixes, middles, suffixes, middle_count)
+    seen = seen_set(space.size, count)
+    # ambiguous parts: keep going past `count` numbers and drop repeated words
+    words_seen = None if space.unambiguous else set()
+    numbers = count if words_seen is None else space.size
+    start = last = time.perf_counter()
+    made = 0
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as out:
+        for fresh in unique_numbers(space.size, numbers, seen, seed, batch):
+            words = space.words(fresh)
+            if words_seen is not None:
+                words = [w for w in words if w not in words_seen and not words_seen.add(w)]
+                words = words[:count - made]
+            if words:
+                out.write("\n".join(words) + "\n")
+            made += len(words)
+            now = time.perf_counter()
+            if report and now - last >= 1:
+                print(f"{made:,} words, {made / (now - start):,.0f} words/sec", file=report)
+                last = now
+            if made >= count:
+                break
+    if made < count:
+        raise ValueError(f"the parts only make {made:,} different words, cannot make {count:,}")
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    return {
+        "words": made,
+        "middles": space.middle_count,
+        "space": space.size,
+        "coverage": made / space.size,
+        "dedup": type(seen).__name__ if words_seen is None else "set of words",
+        "false_positive_rate": seen.false_positive_rate(),
+        "seconds": elapsed,
+        "words_per_sec": made / elapsed,
+    }
+
+
+def benchmark(prefixes, middles, suffixes, count=5_000_000, path=None):
+    """random.choice per part + a set of words, against write_words()."""
+    import os
+    import random
+    import tempfile
+
+    space = WordSpace.fitting(prefixes, middles, suffixes, count)
+    rng = random.Random(0)
+    start = time.perf_counter()
+    seen = set()
+    while len(seen) < count:
+        word = rng.choice(prefixes) + "".join(
+            rng.choice(middles) for _ in range(space.middle_count)) + rng.choice(suffixes)
+        seen.add(word.capitalize())
+    per_word = time.perf_counter() - start
+    del seen
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stats = write_words(path or os.path.join(tmp, "words.txt"), count,
+                            prefixes, middles, suffixes, seed=0)
+    print(f"{count:,} unique words ({space.middle_count} middles): "
+          f"random.choice + set {count / per_word:,.0f} words/sec, "
+          f"write_words {stats['words_per_sec']:,.0f} words/sec (to disk)")
+    return stats
@@ -0,0 +1,202 @@
+# Streaming word mashing
+#
+# mix-word.py (reverse_mash) and 1st-add-last-word.py (create_new_word)
+# combine two words typed at input() prompts. This module applies the same
+# transforms to huge word lists:
+#
+#   python word_mash.py reverse pairs.txt          one "word1 word2" per line
+#   python word_mash.py join firsts.txt seconds.txt  line i of each file
+#   cat pairs.txt | python word_mash.py reverse -
+#
+# Input is read in large blocks, each block is transformed by one list
+# comprehension (no function call per pair), output is written one block
+# at a time, and blocks can be spread over a process pool.
+
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+BLOCK_SIZE = 1 << 22        # characters per block for one pair file
+BLOCK_LINES = 200_000       # lines per block when zipping two files
+
+
+def reverse_mash_many(firsts, seconds):
+    """mix-word.py's reverse_mash for whole lists of words."""
+    return [(a[len(a) // 2:][::-1] + b[:len(b) // 2][::-1]).capitalize()
+            for a, b in zip(firsts, seconds)]
+
+
+def create_new_words(firsts, seconds):
+    """1st-add-last-word.py's create_new_word for whole lists of words."""
+    return [a[:len(a) // 2] + b[len(b) // 2:] for a, b in zip(firsts, seconds)]
+
+
+TRANSFORMS = {"reverse": reverse_mash_many, "join": create_new_words}
+
+
+def split_pairs(text):
+    """(firsts, seconds) from "word1 word2" lines; other lines are skipped."""
+    words = text.split()
+    lines = text.count("\n") + (not text.endswith("\n"))
+    if len(words) == 2 * lines:
+        # fast path when the block is exactly "word1 word2\n" lines: pairing
+        # the words up again must give back the text ("a b c\nd\n" does not)
+        firsts, seconds = words[0::2], words[1::2]
+        body = text[:-1] if text.endswith("\n") else text
+        if "\n".join(map(" ".join, zip(firsts, seconds))) == body:
+            return firsts, seconds
+    pairs = [line.split() for line in text.splitlines()]
+    pairs = [p for p in pairs if len(p) == 2]
+    return [p[0] for p in pairs], [p[1] for p in pairs]
+
+
+def mash_block(transform, left, right=None):
+    """Transform one block; returns (pair count, output text)."""
+    if right is None:
+        firsts, seconds = split_pairs(left)
+    else:
+        firsts, seconds = left.splitlines(), right.splitlines()
+    words = TRANSFORMS[transform](firsts, seconds)
+    return len(words), "\n".join(words) + "\n" if words else ""
+
+
+def read_blocks(pairs_file, block_size=BLOCK_SIZE):
+    """Blocks of whole lines from one pair file."""
+    while True:
+        block = pairs_file.read(block_size)
+        if not block:
+            return
+        if not block.endswith("\n"):
+            block += pairs_file.readline()
+        yield block, None
+
+
+def zip_blocks(first_file, second_file, block_lines=BLOCK_LINES):
+    """Blocks of line-aligned text from two word files (stops at the shorter)."""
+    while True:
+        left = list(islice(first_file, block_lines))
+        right = list(islice(second_file, block_lines))
+        n = min(len(left), len(right))
+        if not n:
+            return
+        yield "".join(left[:n]), "".join(right[:n])
+        if n < block_lines:
+            return
+
+
+def mash_stream(transform, blocks, processes=1):
+    """Yield (pairs, text) per block, in input order.
+
+    processes=1 runs in the calling process; otherwise at most two blocks
+    per worker are in flight.
+    """
+    if transform not in TRANSFORMS:
+        raise ValueError(f"unknown transform {transform!r}, use one of {sorted(TRANSFORMS)}")
+    if processes == 1:
+        for left, right in blocks:
+            yield mash_block(transform, left, right)
+        return
+    workers = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for left, right in blocks:
+            pending.append(pool.submit(mash_block, transform, left, right))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _open(path):
+    if path == "-":
+        return sys.stdin
+    return open(path, encoding="utf-8", errors="replace", buffering=1 << 20)
+
+
+def run(transform, inputs, out=None, processes=1, report=sys.stderr):
+    """Mash one pair file or two zipped word files into out; returns pairs/sec."""
+    out = out or sys.stdout
+    files = [_open(path) for path in inputs]
+    blocks = read_blocks(files[0]) if len(files) == 1 else zip_blocks(*files)
+    total = 0
+    start = last = time.perf_counter()
+    try:
+        for pairs, text in mash_stream(transform, blocks, processes):
+            out.write(text)
+            total += pairs
+            now = time.perf_counter()
+            if report and now - last >= 1:
+                print(f"{total:,} pairs, {total / (now - start):,.0f} pairs/sec", file=report)
+                last = now
+    finally:
+        for f in files:
+            if f is not sys.stdin:
+                f.close()
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    if report:
+        print(f"Mashed {total:,} pairs in {elapsed:.2f}s ({total / elapsed:,.0f} pairs/sec)",
+              file=report)
+    return total / elapsed
+
+
+def benchmark(pairs=2_000_000):
+    """Per-pair function calls (the scripts' way) against mash_block."""
+    import io
+    import random
+
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = ["".join(rng.choices(letters, k=rng.randint(3, 12))) for _ in range(10_000)]
+    text = "".join(f"{rng.choice(words)} {rng.choice(words)}\n" for _ in range(pairs))
+
+    def reverse_mash(word1, word2):
+        half1 = word1[len(word1)//2:][::-1]
+        half2 = word2[:len(word2)//2][::-1]
+        return (half1 + half2).capitalize()
+
+    start = time.perf_counter()
+    out = io.StringIO()
+    for line in io.StringIO(text):
+        w1, w2 = line.split()
+        out.write(reverse_mash(w1, w2) + "\n")
+    per_pair = time.perf_counter() - start
+
+    streamed = io.StringIO()
+    start = time.perf_counter()
+    for _, block in mash_stream("reverse", read_blocks(io.StringIO(text))):
+        streamed.write(block)
+    blocked = time.perf_counter() - start
+
+    assert out.getvalue() == streamed.getvalue()
+    print(f"{pairs:,} pairs: per-pair calls {pairs / per_pair:,.0f} pairs/sec, "
+          f"block mode {pairs / blocked:,.0f} pairs/sec ({per_pair / blocked:.1f}x)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Mash word pairs into new words")
+    parser.add_argument("transform", nargs="?", choices=sorted(TRANSFORMS))
+    parser.add_argument("inputs", nargs="*",
+                        help='one "word1 word2" per line file ("-" = stdin), '
+                             "or two word files zipped line by line")
+    parser.add_argument("-o", "--output", help="write here instead of stdout")
+    parser.add_argument("-p", "--processes", type=int, default=1,
+                        help="worker processes (0 = one per CPU)")
+    parser.add_argument("--bench", type=int, metavar="PAIRS")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(args.bench)
+    elif not args.transform or len(args.inputs) not in (1, 2):
+        parser.error("give a transform and one pair file or two word files")
+    else:
+        out = open(args.output, "w", encoding="utf-8", buffering=1 << 20) if args.output else None
+        try:
+            run(args.transform, args.inputs, out, args.processes or None)
+        finally:
+            if out:
+                out.close()